@@ -26,6 +26,7 @@ from pathlib import Path
 import time
 import hashlib
 from collections import defaultdict, Counter
+from functools import lru_cache
 from datetime import datetime, timedelta
 import difflib
 import threading
@@ -37,6 +38,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 import subprocess
 from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.wsgi import wrap_file
 import signal
 import sys
 
@@ -58,20 +60,34 @@ from core.history import (
 )
 
 from core.inference import inference_engine
-from core.file_utils import validate_path, fix_file_ownership, get_file_format
+from core.file_utils import validate_path, queue_file_ownership_fix, get_file_format, list_audio_files, is_audio_file
 from core.metadata.normalizer import normalize_metadata_tags, get_metadata_field_mapping
 from core.metadata.reader import read_metadata, get_format_limitations
 from core.metadata.writer import apply_metadata_to_file
 from core.metadata.mutagen_handler import mutagen_handler
-from core.album_art.extractor import extract_album_art
+from core.album_art.extractor import extract_album_art, extract_album_art_bytes
 from core.album_art.processor import detect_corrupted_album_art, fix_corrupted_album_art
 from core.album_art.manager import (
     save_album_art_to_file, process_album_art_change, 
     prepare_batch_album_art_change, record_batch_album_art_history
 )
-from core.batch.processor import process_folder_files
+from core.batch.processor import process_folder_files, scan_audio_files
+from core.json_provider import OrjsonProvider
+
+# Read size for streamed audio ranges
+STREAM_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Characters allowed in custom field names
+_FIELD_NAME_RE = re.compile(r'^[A-Za-z0-9_ ]+$')
+
+# Fields supported by the inference engine
+_VALID_INFER_FIELDS = frozenset(('title', 'artist', 'album', 'albumartist', 'date', 'genre', 'track', 'disc', 'composer'))
+
+# Standard tag fields; anything else is written as a custom field
+_STANDARD_FIELD_SET = frozenset(('title', 'artist', 'album', 'albumartist', 'date', 'genre', 'track', 'disc', 'composer'))
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure for reverse proxy
 # This ensures Flask correctly interprets headers set by the reverse proxy
@@ -116,8 +132,8 @@ def add_security_headers(response):
     )
     response.headers['Content-Security-Policy'] = csp
     
-    # Cache-control headers for JSON responses
-    if response.mimetype == 'application/json':
+    # Cache-control headers for JSON responses (validated responses set their own)
+    if response.mimetype == 'application/json' and 'ETag' not in response.headers:
         response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, private'
         response.headers['Pragma'] = 'no-cache'
         response.headers['Expires'] = '0'
@@ -142,6 +158,74 @@ def sanitize_log_data(data):
             sanitized[key] = value
     return sanitized
 
+def get_request_data():
+    """Request payload as a dict
+    
+    JSON bodies are returned as-is. multipart/form-data bodies carry their fields
+    as form values and album art as a raw 'art' file part, which is returned as
+    bytes so it never goes through base64.
+    """
+    if request.mimetype == 'multipart/form-data':
+        data = request.form.to_dict()
+        art_file = request.files.get('art')
+        if art_file:
+            data['art'] = art_file.read()
+        return data
+    return request.json
+
+def get_art_version(filepath):
+    """Version token for a file's album art, derived from the file's mtime and size"""
+    st = os.stat(filepath)
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+def _parse_byte_range(range_header):
+    """Parse "bytes=start-[end]" into (start, end or None); None for anything else
+    
+    Only the first range of a multi-range header is used. Plain str.partition
+    is enough for this grammar, so no regex runs per stream request.
+    """
+    unit, _, spec = range_header.partition('=')
+    if unit != 'bytes':
+        return None
+    start, dash, end = spec.partition(',')[0].partition('-')
+    if not dash or not start.isdecimal() or (end and not end.isdecimal()):
+        return None
+    return int(start), int(end) if end else None
+
+class RangeFile:
+    """File-like view of a byte range, for handing to the WSGI server's file_wrapper
+    
+    Servers that use sendfile() (e.g. Gunicorn) start at the current fd offset and
+    stop at Content-Length; servers that iterate read() are bounded by remaining.
+    """
+    
+    def __init__(self, file_path, start, length):
+        self.file = open(file_path, 'rb')
+        self.file.seek(start)
+        self.remaining = length
+        
+        # Playback reads the range front to back; ask for aggressive readahead
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(self.file.fileno(), start, length, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+    
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+    
+    def fileno(self):
+        return self.file.fileno()
+    
+    def close(self):
+        self.file.close()
+
 # =============
 # APP FUNCTIONS
 # =============
@@ -170,7 +254,10 @@ def stream_audio(filepath):
             return jsonify({'error': 'File not found'}), 404
         
         file_size = os.path.getsize(file_path)
-        range_header = request.headers.get('range', None)
+        range_header = request.headers.get('range', '').strip()
+        
+        # Only parse headers using the bytes unit; anything else gets the full file
+        byte_range = _parse_byte_range(range_header)
         
         # Prepare filename for Content-Disposition header
         basename = os.path.basename(file_path)
@@ -181,46 +268,36 @@ def stream_audio(filepath):
         ext = os.path.splitext(file_path.lower())[1]
         mimetype = MIME_TYPES.get(ext, 'audio/mpeg')
         
-        if range_header:
-            # Parse range header
-            byte_start = 0
-            byte_end = file_size - 1
+        if byte_range:
+            byte_start, byte_end = byte_range
+            byte_end = file_size - 1 if byte_end is None else min(byte_end, file_size - 1)
             
-            match = re.search(r'bytes=(\d+)-(\d*)', range_header)
-            if match:
-                byte_start = int(match.group(1))
-                if match.group(2):
-                    byte_end = int(match.group(2))
+            if byte_start > byte_end:
+                return Response(status=416, headers={'Content-Range': f'bytes */{file_size}'})
             
-            # Generate partial content
-            def generate():
-                with open(file_path, 'rb') as f:
-                    f.seek(byte_start)
-                    remaining = byte_end - byte_start + 1
-                    chunk_size = 8192
-                    
-                    while remaining > 0:
-                        to_read = min(chunk_size, remaining)
-                        chunk = f.read(to_read)
-                        if not chunk:
-                            break
-                        remaining -= len(chunk)
-                        yield chunk
+            content_length = byte_end - byte_start + 1
+            
+            # Let the server send the range itself when it can (sendfile() under
+            # Gunicorn); otherwise Werkzeug iterates it in STREAM_CHUNK_SIZE reads
+            body = wrap_file(request.environ, RangeFile(file_path, byte_start, content_length),
+                             STREAM_CHUNK_SIZE)
             
             return Response(
-                generate(),
+                body,
                 status=206,
                 mimetype=mimetype,
+                direct_passthrough=True,
                 headers={
                     'Content-Range': f'bytes {byte_start}-{byte_end}/{file_size}',
                     'Accept-Ranges': 'bytes',
-                    'Content-Length': str(byte_end - byte_start + 1),
+                    'Content-Length': str(content_length),
                     'Content-Disposition': f'inline; filename="{safe_filename}"; filename*=UTF-8\'\'{utf8_filename}'
                 }
             )
         else:
-            # Return full file
-            return send_file(file_path, mimetype=mimetype, as_attachment=False)
+            # Return full file (an unparseable Range header is ignored rather than rejected)
+            return send_file(file_path, mimetype=mimetype, as_attachment=False,
+                             conditional=not range_header)
             
     except ValueError:
         return jsonify({'error': 'Invalid path'}), 403
@@ -241,15 +318,22 @@ def stream_wav_transcoded(filepath):
         if not file_path.lower().endswith('.wv'):
             return jsonify({'error': 'Not a WavPack file'}), 400
             
-        # Use wvunpack to convert to WAV and stream
+        # Use wvunpack to convert to WAV and stream. stderr is discarded: nothing
+        # reads it, and an undrained pipe would stall the decoder once it fills
         process = subprocess.Popen(
             ['wvunpack', '-q', file_path, '-o', '-'],
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
+            stderr=subprocess.DEVNULL
         )
         
+        def stop_decoder():
+            # Stop the decoder if the client disconnects mid-stream, and reap it
+            process.kill()
+            process.wait()
+            process.stdout.close()
+        
         # Stream the WAV output
-        return Response(
+        response = Response(
             process.stdout,
             mimetype='audio/wav',
             headers={
@@ -257,45 +341,86 @@ def stream_wav_transcoded(filepath):
                 'Cache-Control': 'no-cache'
             }
         )
+        response.call_on_close(stop_decoder)
+        return response
         
     except Exception as e:
         logger.error(f"Error transcoding WavPack file {filepath}: {e}")
         return jsonify({'error': str(e)}), 500
 
-def build_tree_items(path, rel_path=''):
-    """Build tree items for a directory"""
+@lru_cache(maxsize=8192)
+def _folder_audio_files(folder_path, folder_mtime_ns):
+    """Audio files directly inside a folder (cached until the folder's mtime changes)
+    
+    Adding, removing or renaming files bumps the folder's mtime, so the listing
+    stays valid. Tag edits rewrite files in place without touching it, so sizes
+    are not cached here.
+    """
+    audio_files = []
+    with os.scandir(folder_path) as sub_entries:
+        for sub_entry in sub_entries:
+            if not SHOW_HIDDEN_FILES and sub_entry.name.startswith('.'):
+                continue
+            # Cheap extension check first; is_file() may need a stat on some filesystems
+            if is_audio_file(sub_entry.name) and sub_entry.is_file():
+                audio_files.append(sub_entry.path)
+    return tuple(audio_files)
+
+def _folder_audio_summary(folder_path, folder_mtime_ns):
+    """Whether a folder directly contains audio files, and their current total size"""
+    audio_files = _folder_audio_files(folder_path, folder_mtime_ns)
+    folder_size = 0
+    for file_path in audio_files:
+        try:
+            folder_size += os.stat(file_path).st_size
+        except OSError:
+            pass
+    return bool(audio_files), folder_size
+
+@lru_cache(maxsize=4096)
+def _list_subfolders(path, mtime_ns):
+    """Sorted (name, path) pairs of a directory's visible subfolders (cached until its mtime changes)"""
+    with os.scandir(path) as it:
+        subfolders = [
+            (entry.name, entry.path)
+            for entry in it
+            # Skip hidden folders (.git, caches, ...) unless configured to show them
+            if (SHOW_HIDDEN_FILES or not entry.name.startswith('.')) and entry.is_dir()
+        ]
+    # Sort only the folders, not every file in the directory
+    subfolders.sort()
+    return tuple(subfolders)
+
+def build_tree_items(path, rel_path='', with_audio=True):
+    """Build tree items for a directory (hasAudio/size only when with_audio is set)"""
     items = []
     try:
-        for item in sorted(os.listdir(path)):
-            item_path = os.path.join(path, item)
+        # Creating, removing or renaming a subfolder bumps the parent's mtime
+        for item, item_path in _list_subfolders(path, os.stat(path).st_mtime_ns):
             item_rel_path = os.path.join(rel_path, item) if rel_path else item
             
-            if os.path.isdir(item_path):
-                # Check if folder contains audio files
-                has_audio = any(
-                    f.lower().endswith(AUDIO_EXTENSIONS)
-                    for f in os.listdir(item_path)
-                    if os.path.isfile(os.path.join(item_path, f))
-                )
-                
-                # Calculate folder size (optional - can be expensive for large folders)
-                folder_size = 0
-                try:
-                    # Quick size calculation - only immediate audio files, not recursive
-                    for f in os.listdir(item_path):
-                        if os.path.isfile(os.path.join(item_path, f)) and f.lower().endswith(AUDIO_EXTENSIONS):
-                            folder_size += os.path.getsize(os.path.join(item_path, f))
-                except OSError:
-                    folder_size = 0
-                
-                items.append({
-                    'name': item,
-                    'path': item_rel_path,
-                    'type': 'folder',
-                    'hasAudio': has_audio,
-                    'created': os.path.getctime(item_path),
-                    'size': folder_size  # Add folder size
-                })
+            # Stat each folder fresh: its ctime/mtime change with its own contents
+            try:
+                entry_stat = os.stat(item_path)
+            except FileNotFoundError:
+                continue
+            
+            folder_item = {
+                'name': item,
+                'path': item_rel_path,
+                'type': 'folder',
+                'created': entry_stat.st_ctime
+            }
+            
+            if with_audio:
+                # Check if folder contains audio files and calculate their total size
+                # (only immediate audio files, not recursive); the file listing is
+                # cached per folder mtime, the sizes are read fresh
+                has_audio, folder_size = _folder_audio_summary(item_path, entry_stat.st_mtime_ns)
+                folder_item['hasAudio'] = has_audio
+                folder_item['size'] = folder_size
+            
+            items.append(folder_item)
     except PermissionError:
         pass
     
@@ -311,7 +436,9 @@ def get_tree(subpath=''):
         if not os.path.exists(current_path):
             return jsonify({'error': 'Path not found'}), 404
         
-        items = build_tree_items(current_path, subpath)
+        # Scanning each child folder is only needed for hasAudio/size (?withAudio=1)
+        with_audio = request.args.get('withAudio') == '1'
+        items = build_tree_items(current_path, subpath, with_audio)
         return jsonify({'items': items})
         
     except ValueError:
@@ -329,21 +456,31 @@ def get_files(folder_path):
         if not os.path.exists(current_path):
             return jsonify({'error': 'Path not found'}), 404
         
-        files = []
-        
-        # List files in the directory (not subdirectories)
-        for filename in sorted(os.listdir(current_path)):
-            # Skip hidden files unless configured to show them
-            if not SHOW_HIDDEN_FILES and filename.startswith('.'):
-                continue
-                
-            file_path = os.path.join(current_path, filename)
-            if os.path.isfile(file_path) and filename.lower().endswith(AUDIO_EXTENSIONS):
-                rel_path = os.path.relpath(file_path, MUSIC_DIR)
+        # List audio files in the directory (not subdirectories); filter first so
+        # only the audio entries are sorted
+        with os.scandir(current_path) as it:
+            entries = [
+                entry for entry in it
+                # Skip hidden files unless configured to show them
+                if (SHOW_HIDDEN_FILES or not entry.name.startswith('.'))
+                and is_audio_file(entry.name) and entry.is_file()
+            ]
+        entries.sort(key=lambda e: e.name)
+        
+        # Every file shares the folder's relative path
+        rel_dir = os.path.relpath(current_path, MUSIC_DIR)
+        
+        def generate():
+            # Stream the listing in batches of encoded files, like /history, instead
+            # of building every dict and the whole JSON body first
+            chunk = [b'{"files":[']
+            for i, entry in enumerate(entries):
+                filename = entry.name
+                rel_path = filename if rel_dir == '.' else os.path.join(rel_dir, filename)
                 
                 # Get file stats for date and size
                 try:
-                    file_stats = os.stat(file_path)
+                    file_stats = entry.stat()
                     file_date = int(file_stats.st_mtime)  # Modification time as Unix timestamp
                     file_size = file_stats.st_size         # Size in bytes
                 except OSError:
@@ -351,15 +488,22 @@ def get_files(folder_path):
                     file_date = 0
                     file_size = 0
                 
-                files.append({
+                if i:
+                    chunk.append(b',')
+                chunk.append(app.json.dumpb({
                     'name': filename,
                     'path': rel_path,
                     'folder': '.',  # All files are in the current folder
                     'date': file_date,
                     'size': file_size
-                })
+                }))
+                if len(chunk) >= 128:
+                    yield b''.join(chunk)
+                    chunk = []
+            chunk.append(b']}')
+            yield b''.join(chunk)
         
-        return jsonify({'files': files})
+        return Response(generate(), mimetype='application/json')
         
     except ValueError:
         return jsonify({'error': 'Invalid path'}), 403
@@ -396,7 +540,7 @@ def rename_file():
         
         # Rename file
         os.rename(old_path, new_path)
-        fix_file_ownership(new_path)
+        queue_file_ownership_fix(new_path)
         
         # Update all history references to use the new filename
         history.update_file_references(old_path, new_path)
@@ -457,12 +601,12 @@ def rename_folder():
         old_files = []
         for root, dirs, files in os.walk(old_path):
             for file in files:
-                if file.lower().endswith(AUDIO_EXTENSIONS):
+                if is_audio_file(file):
                     old_files.append(os.path.join(root, file))
         
         # Rename folder
         os.rename(old_path, new_path)
-        fix_file_ownership(new_path)
+        queue_file_ownership_fix(new_path)
         
         # Update history references for all files in the renamed folder
         for old_file_path in old_files:
@@ -503,10 +647,11 @@ def get_metadata(filename):
         # Discover all fields
         all_fields = mutagen_handler.discover_all_metadata(filepath)
         
-        # Get album art
-        art = extract_album_art(filepath)
-        standard_fields['hasArt'] = bool(art)
-        standard_fields['art'] = art
+        # Only check for album art here; the image itself is extracted and
+        # served separately by /albumart
+        has_art = mutagen_handler.has_album_art(filepath)
+        standard_fields['hasArt'] = has_art
+        standard_fields['artVersion'] = get_art_version(filepath) if has_art else None
         
         # Get format limitations
         base_format = standard_fields.get('base_format', '')
@@ -521,7 +666,6 @@ def get_metadata(filename):
             'standard_fields': standard_fields,  # Existing 9 fields (with empty values for compatibility)
             'existing_standard_fields': existing_standard_fields,  # Only fields that actually exist
             'all_fields': all_fields,            # All discovered fields
-            'album_art_data': art,
             'formatLimitations': format_limitations
         }
         
@@ -538,6 +682,37 @@ def get_metadata(filename):
         logger.error(f"Error reading metadata for {filename}: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/albumart/<path:filename>')
+def get_album_art(filename):
+    """Serve a file's embedded album art as raw image bytes"""
+    try:
+        filepath = validate_path(os.path.join(MUSIC_DIR, filename))
+        etag = get_art_version(filepath)
+        
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            image_data = extract_album_art_bytes(filepath)
+            if not image_data:
+                return jsonify({'error': 'No album art'}), 404
+            response = Response(image_data, mimetype=mutagen_handler.detect_mime_type(image_data))
+        
+        response.set_etag(etag)
+        # Versioned URLs (?v=<artVersion>) change whenever the file does
+        if request.args.get('v') == etag:
+            response.headers['Cache-Control'] = 'private, max-age=31536000, immutable'
+        else:
+            response.headers['Cache-Control'] = 'no-cache, private'
+        return response
+        
+    except FileNotFoundError:
+        return jsonify({'error': 'File not found'}), 404
+    except ValueError:
+        return jsonify({'error': 'Invalid path'}), 403
+    except Exception as e:
+        logger.error(f"Error serving album art for {filename}: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/metadata/<path:filename>', methods=['POST'])
 def set_metadata(filename):
     """Set metadata for a file"""
@@ -547,7 +722,7 @@ def set_metadata(filename):
         if not os.path.exists(filepath):
             return jsonify({'error': 'File not found'}), 404
         
-        data = request.json
+        data = get_request_data()
         
         # Get current metadata before changes using the correct method for OGG/OPUS
         current_metadata = read_metadata(filepath)
@@ -559,6 +734,7 @@ def set_metadata(filename):
         has_art_change, art_data, remove_art = process_album_art_change(filepath, data, current_metadata)
         
         # Track individual metadata field changes
+        changed_tags = {}
         for field, new_value in metadata_tags.items():
             old_value = current_metadata.get(field, '')
             # Normalize for comparison (space = empty)
@@ -566,6 +742,7 @@ def set_metadata(filename):
             normalized_new = '' if new_value == ' ' else new_value
             
             if normalized_old != normalized_new:
+                changed_tags[field] = new_value
                 # Determine action type
                 action_type = 'clear_field' if not normalized_new and normalized_old else 'metadata_change'
                 action = create_metadata_action(filepath, field, old_value, new_value, action_type)
@@ -574,10 +751,11 @@ def set_metadata(filename):
         # Apply all changes
         if has_art_change:
             # This will apply both metadata and album art, and track art history
-            save_album_art_to_file(filepath, art_data, remove_art, metadata_tags, track_history=True)
-        else:
+            save_album_art_to_file(filepath, art_data, remove_art, changed_tags, track_history=True)
+        elif changed_tags:
             # Just apply metadata changes without album art
-            apply_metadata_to_file(filepath, metadata_tags)
+            apply_metadata_to_file(filepath, changed_tags)
+        # Nothing changed: leave the file untouched
         
         return jsonify({'status': 'success'})
         
@@ -672,7 +850,7 @@ def create_custom_field():
         return jsonify({'status': 'error', 'message': 'Field name contains invalid characters'}), 400
     
     # Sanitize field name (alphanumeric, underscore, and spaces)
-    if not re.match(r'^[A-Za-z0-9_ ]+$', field_name):
+    if not _FIELD_NAME_RE.match(field_name):
         return jsonify({'status': 'error', 'message': 'Invalid field name. Only alphanumeric characters, underscores, and spaces are allowed.'}), 400
     
     try:
@@ -692,11 +870,7 @@ def create_custom_field():
             create_values = {}
             
             # Get all audio files in folder
-            audio_files = []
-            for filename in os.listdir(folder_path):
-                file_path = os.path.join(folder_path, filename)
-                if os.path.isfile(file_path) and filename.lower().endswith(AUDIO_EXTENSIONS):
-                    audio_files.append(file_path)
+            audio_files = list_audio_files(folder_path)
             
             # Check each file and categorize
             for file_path in audio_files:
@@ -847,38 +1021,43 @@ def create_custom_field():
 @app.route('/apply-art-to-folder', methods=['POST'])
 def apply_art_to_folder():
     """Apply album art to all audio files in a folder"""
-    data = request.json
+    data = get_request_data()
     folder_path = data.get('folderPath', '')
     art_data = data.get('art')
     
     if not art_data:
         return jsonify({'error': 'No album art provided'}), 400
     
+    # Decode once; every file then embeds the same raw image bytes
+    if isinstance(art_data, bytes):
+        art_bytes = art_data
+    else:
+        try:
+            art_bytes = base64.b64decode(art_data.split(',', 1)[1] if ',' in art_data else art_data)
+        except ValueError:
+            return jsonify({'error': 'Invalid album art data'}), 400
+    
     # Get list of audio files
     abs_folder_path = validate_path(os.path.join(MUSIC_DIR, folder_path) if folder_path else MUSIC_DIR)
-    audio_files = []
-    for filename in os.listdir(abs_folder_path):
-        file_path = os.path.join(abs_folder_path, filename)
-        if os.path.isfile(file_path) and filename.lower().endswith(AUDIO_EXTENSIONS):
-            audio_files.append(file_path)
+    audio_files = list_audio_files(abs_folder_path)
     
     # Prepare for batch changes
-    file_changes = prepare_batch_album_art_change(folder_path, art_data, audio_files)
+    file_changes = prepare_batch_album_art_change(folder_path, art_bytes, audio_files)
     
-    def apply_art(file_path):
-        apply_metadata_to_file(file_path, {}, art_data)
+    # OGG/Opus and WMA files in the folder share one built picture payload
+    picture_cache = {}
     
-    # Use process_folder_files to handle the batch operation
-    response = process_folder_files(folder_path, apply_art, "updated with album art")
+    def apply_art(file_path):
+        apply_metadata_to_file(file_path, {}, art_bytes, picture_cache=picture_cache)
     
-    # Check if it's a successful response by examining the response data
-    if response.status_code == 200:
-        response_data = response.get_json()
-        if response_data.get('status') in ['success', 'partial']:
-            # Record batch changes in history
-            record_batch_album_art_history(folder_path, art_data, file_changes)
+    def record_history(result):
+        # Record batch changes in history
+        record_batch_album_art_history(folder_path, art_bytes, file_changes)
     
-    return response
+    # Use process_folder_files to handle the batch operation
+    return process_folder_files(folder_path, apply_art, "updated with album art",
+                                stream=request.args.get('stream') == '1',
+                                on_complete=record_history)
 
 @app.route('/apply-field-to-folder', methods=['POST'])
 def apply_field_to_folder():
@@ -897,79 +1076,85 @@ def apply_field_to_folder():
     create_values = {}
     abs_folder_path = validate_path(os.path.join(MUSIC_DIR, folder_path) if folder_path else MUSIC_DIR)
     
-    for filename in os.listdir(abs_folder_path):
-        file_path = os.path.join(abs_folder_path, filename)
-        if os.path.isfile(file_path) and filename.lower().endswith(AUDIO_EXTENSIONS):
-            try:
-                # Check if field exists using both methods
-                existing_metadata = mutagen_handler.read_existing_metadata(file_path)
-                all_discovered = mutagen_handler.discover_all_metadata(file_path)
-                
-                # Check all case variations
-                field_lower = field.lower()
-                field_upper = field.upper()
-                
-                # For standard fields, check exact match
-                field_exists = (field in existing_metadata or 
-                              field_lower in existing_metadata or
-                              field_upper in existing_metadata or
-                              field in all_discovered or
-                              field_lower in all_discovered or
-                              field_upper in all_discovered)
-                
-                # For custom fields, also check format-specific representations with case variations
-                if not field_exists and field.lower() not in ['title', 'artist', 'album', 'albumartist', 'date', 'genre', 'track', 'disc', 'composer']:
-                    # Check if any discovered field matches case-insensitively
-                    for discovered_field in all_discovered.keys():
-                        # For format-specific fields, extract the actual field name
-                        actual_field_name = discovered_field
-                        if discovered_field.startswith('TXXX:'):
-                            actual_field_name = discovered_field[5:]
-                        elif discovered_field.startswith('WM/'):
-                            actual_field_name = discovered_field[3:]
-                        elif discovered_field.startswith('----:com.apple.iTunes:'):
-                            actual_field_name = discovered_field[22:]
-                        
-                        # Case-insensitive comparison
-                        if actual_field_name.lower() == field.lower():
-                            field_exists = True
-                            break
-                
-                if field_exists:
-                    # Get existing value for update tracking
-                    old_value = (existing_metadata.get(field) or 
-                               existing_metadata.get(field.upper()) or
-                               all_discovered.get(field, {}).get('value') or
-                               all_discovered.get(field.upper(), {}).get('value') or '')
-                    file_changes.append((file_path, old_value, value))
-                else:
-                    # Track for creation
-                    files_to_create.append(file_path)
-                    create_values[file_path] = value
-            except:
-                pass
+    # Case variations don't depend on the file, so compute them once
+    field_lower = field.lower()
+    field_upper = field.upper()
+    is_custom_field = field_lower not in _STANDARD_FIELD_SET
+    
+    def scan_field(file_path):
+        try:
+            # Check if field exists using both methods
+            existing_metadata = mutagen_handler.read_existing_metadata(file_path)
+            all_discovered = mutagen_handler.discover_all_metadata(file_path)
+            
+            # For standard fields, check exact match
+            field_exists = (field in existing_metadata or 
+                          field_lower in existing_metadata or
+                          field_upper in existing_metadata or
+                          field in all_discovered or
+                          field_lower in all_discovered or
+                          field_upper in all_discovered)
+            
+            # For custom fields, also check format-specific representations with case variations
+            if not field_exists and is_custom_field:
+                # Check if any discovered field matches case-insensitively
+                for discovered_field in all_discovered:
+                    # For format-specific fields, extract the actual field name
+                    actual_field_name = discovered_field
+                    if discovered_field.startswith('TXXX:'):
+                        actual_field_name = discovered_field[5:]
+                    elif discovered_field.startswith('WM/'):
+                        actual_field_name = discovered_field[3:]
+                    elif discovered_field.startswith('----:com.apple.iTunes:'):
+                        actual_field_name = discovered_field[22:]
+                    
+                    # Case-insensitive comparison
+                    if actual_field_name.lower() == field_lower:
+                        field_exists = True
+                        break
+            
+            if not field_exists:
+                return False, None
+            
+            # Get existing value for update tracking
+            old_value = (existing_metadata.get(field) or 
+                       existing_metadata.get(field_upper) or
+                       all_discovered.get(field, {}).get('value') or
+                       all_discovered.get(field_upper, {}).get('value') or '')
+            return True, old_value
+        except:
+            return None
+    
+    # Files are read concurrently; results are categorized in folder order
+    for file_path, scanned in scan_audio_files(abs_folder_path, scan_field):
+        if scanned is None:
+            continue
+        field_exists, old_value = scanned
+        if field_exists:
+            file_changes.append((file_path, old_value, value))
+        else:
+            # Track for creation
+            files_to_create.append(file_path)
+            create_values[file_path] = value
     
     def apply_field(file_path):
         apply_metadata_to_file(file_path, {field: value})
     
-    response = process_folder_files(folder_path, apply_field, f"updated with {field}")
-    
-    # Check if it's a successful response by examining the response data
-    if response.status_code == 200:
-        response_data = response.get_json()
-        if response_data.get('status') in ['success', 'partial']:
-            # Add appropriate history actions
-            if file_changes:
-                # Add batch metadata action for updates
-                action = create_batch_metadata_action(folder_path, field, value, file_changes)
-                history.add_action(action)
-            
-            if files_to_create:
-                # Add batch field creation action for new fields
-                batch_action = create_batch_field_creation_action(files_to_create, field, create_values)
-                history.add_action(batch_action)
+    def record_history(result):
+        # Add appropriate history actions
+        if file_changes:
+            # Add batch metadata action for updates
+            action = create_batch_metadata_action(folder_path, field, value, file_changes)
+            history.add_action(action)
+        
+        if files_to_create:
+            # Add batch field creation action for new fields
+            batch_action = create_batch_field_creation_action(files_to_create, field, create_values)
+            history.add_action(batch_action)
     
-    return response
+    return process_folder_files(folder_path, apply_field, f"updated with {field}",
+                                stream=request.args.get('stream') == '1',
+                                on_complete=record_history)
 
 @app.route('/delete-field-from-folder', methods=['POST'])
 def delete_field_from_folder():
@@ -987,50 +1172,50 @@ def delete_field_from_folder():
         files_skipped = 0
         abs_folder_path = validate_path(os.path.join(MUSIC_DIR, folder_path) if folder_path else MUSIC_DIR)
         
-        # Pre-scan files to check which have the field
-        for filename in os.listdir(abs_folder_path):
-            file_path = os.path.join(abs_folder_path, filename)
-            if os.path.isfile(file_path) and filename.lower().endswith(AUDIO_EXTENSIONS):
-                try:
-                    # Check file permissions first
-                    if not os.access(file_path, os.W_OK):
-                        raise PermissionError(f"No write permission for {filename}")
-                    
-                    all_fields = mutagen_handler.get_all_fields(file_path)
-                    metadata = mutagen_handler.read_metadata(file_path)
-                    
-                    # Check if field exists
-                    if field_id in all_fields or field_id in metadata:
-                        old_value = all_fields.get(field_id, {}).get('value', '') or metadata.get(field_id, '')
-                        file_changes.append((file_path, old_value))
-                    else:
-                        files_skipped += 1
-                except PermissionError:
-                    # Re-raise permission errors to be caught by process_folder_files
-                    raise
-                except Exception as e:
-                    logger.warning(f"Error pre-scanning {filename}: {str(e)}")
-                    continue
+        def scan_field(file_path):
+            filename = os.path.basename(file_path)
+            try:
+                # Check file permissions first
+                if not os.access(file_path, os.W_OK):
+                    raise PermissionError(f"No write permission for {filename}")
+                
+                all_fields = mutagen_handler.get_all_fields(file_path)
+                metadata = mutagen_handler.read_metadata(file_path)
+                
+                # Check if field exists
+                if field_id in all_fields or field_id in metadata:
+                    return all_fields.get(field_id, {}).get('value', '') or metadata.get(field_id, '')
+                return False
+            except PermissionError:
+                # Re-raise permission errors to be caught by process_folder_files
+                raise
+            except Exception as e:
+                logger.warning(f"Error pre-scanning {filename}: {str(e)}")
+                return None
+        
+        # Pre-scan files concurrently to check which have the field
+        for file_path, old_value in scan_audio_files(abs_folder_path, scan_field):
+            if old_value is False:
+                files_skipped += 1
+            elif old_value is not None:
+                file_changes.append((file_path, old_value))
         
         # Process deletions
         def delete_field_from_file(file_path):
             return mutagen_handler.delete_field(file_path, field_id)
         
-        response = process_folder_files(folder_path, delete_field_from_file, f"deleted field {field_id}")
-        
-        # Add skipped files count to response
-        if response.status_code == 200:
-            response_data = response.get_json()
-            response_data['filesSkipped'] = files_skipped
+        def finish(result):
+            # Add skipped files count to response
+            result['filesSkipped'] = files_skipped
             
             # Record in history if successful
-            if response_data.get('status') in ['success', 'partial'] and file_changes:
+            if file_changes:
                 action = create_batch_delete_field_action(folder_path, field_id, file_changes)
                 history.add_action(action)
-            
-            return jsonify(response_data)
         
-        return response
+        return process_folder_files(folder_path, delete_field_from_file, f"deleted field {field_id}",
+                                    stream=request.args.get('stream') == '1',
+                                    on_complete=finish)
         
     except ValueError:
         return jsonify({'error': 'Invalid path'}), 403
@@ -1038,14 +1223,46 @@ def delete_field_from_folder():
         logger.error(f"Error in batch field deletion: {e}")
         return jsonify({'error': str(e)}), 500
 
+# ===============
+# CACHE ENDPOINTS
+# ===============
+
+@app.route('/cache/clear', methods=['POST'])
+def clear_caches():
+    """Clear cached metadata reads and folder listings"""
+    mutagen_handler.clear_read_cache()
+    _list_audio_siblings.cache_clear()
+    _folder_audio_files.cache_clear()
+    _list_subfolders.cache_clear()
+    return jsonify({
+        'status': 'success',
+        'message': 'Caches cleared successfully'
+    })
+
 # =================
 # HISTORY ENDPOINTS
 # =================
 
 @app.route('/history')
 def get_history():
-    """Get all editing history"""
-    return jsonify({'actions': history.get_all_actions()})
+    """Get all editing history (pass ?summary=1 for a compact listing)"""
+    summary = request.args.get('summary') in ('1', 'true')
+    
+    def generate():
+        # Stream the list in batches of encoded actions instead of serializing it
+        # whole; each batch is one write to the client
+        chunk = [b'{"actions":[']
+        for i, action in enumerate(history.iter_actions(summary=summary)):
+            if i:
+                chunk.append(b',')
+            chunk.append(app.json.dumpb(action))
+            if len(chunk) >= 128:
+                yield b''.join(chunk)
+                chunk = []
+        chunk.append(b']}')
+        yield b''.join(chunk)
+    
+    return Response(generate(), mimetype='application/json')
 
 @app.route('/history/<action_id>')
 def get_history_action(action_id):
@@ -1054,7 +1271,19 @@ def get_history_action(action_id):
     if not action:
         return jsonify({'error': 'Action not found'}), 404
     
-    return jsonify(action.get_details())
+    # The details only change when the action is undone/redone or its files are renamed
+    etag = hashlib.blake2b(
+        f"{action.id}:{action.is_undone}:{chr(0).join(action.files)}".encode(),
+        digest_size=8
+    ).hexdigest()
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(action.get_details())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache, private'
+    return response
 
 @app.route('/history/<action_id>/undo', methods=['POST'])
 def undo_action(action_id):
@@ -1069,6 +1298,10 @@ def undo_action(action_id):
     try:
         errors = []
         files_updated = 0
+        # Display names for error messages, computed once per action
+        basenames = {filepath: os.path.basename(filepath) for filepath in action.files}
+        # Each file is written at most once, even if the action lists it twice
+        unique_files = list(dict.fromkeys(action.files))
         
         if action.action_type in [ActionType.METADATA_CHANGE, ActionType.CLEAR_FIELD]:
             # Undo single metadata change or field clear
@@ -1080,17 +1313,21 @@ def undo_action(action_id):
                 apply_metadata_to_file(filepath, {field: old_value})
                 files_updated += 1
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_METADATA:
             # Undo batch metadata changes
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     old_value = action.old_values.get(filepath, '')
+                    if old_value == action.new_values.get(filepath, ''):
+                        # Unchanged by the action: count as updated, but skip the rewrite
+                        files_updated += 1
+                        continue
                     apply_metadata_to_file(filepath, {action.field: old_value})
                     files_updated += 1
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
 
         elif action.action_type in [ActionType.ALBUM_ART_CHANGE, ActionType.ALBUM_ART_DELETE]:
             # Undo album art change
@@ -1098,34 +1335,34 @@ def undo_action(action_id):
             old_art_path = action.old_values[filepath]
             
             try:
-                if old_art_path:
-                    old_art = history.load_album_art(old_art_path)
-                    if old_art:
-                        apply_metadata_to_file(filepath, {}, old_art)
-                    else:
-                        apply_metadata_to_file(filepath, {}, remove_art=True)
-                else:
+                if not old_art_path:
+                    # No art was stored for this state, so the file had none
                     apply_metadata_to_file(filepath, {}, remove_art=True)
+                elif os.path.exists(old_art_path):
+                    apply_metadata_to_file(filepath, {}, art_path=old_art_path)
+                else:
+                    # The snapshot is gone; leave the file's current art alone
+                    raise FileNotFoundError('Stored album art is no longer available')
                 files_updated += 1
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_ALBUM_ART:
             # Undo batch album art changes
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     old_art_path = action.old_values.get(filepath, '')
-                    if old_art_path:
-                        old_art = history.load_album_art(old_art_path)
-                        if old_art:
-                            apply_metadata_to_file(filepath, {}, old_art)
-                        else:
-                            apply_metadata_to_file(filepath, {}, remove_art=True)
-                    else:
+                    if not old_art_path:
+                        # No art was stored for this state, so the file had none
                         apply_metadata_to_file(filepath, {}, remove_art=True)
+                    elif os.path.exists(old_art_path):
+                        apply_metadata_to_file(filepath, {}, art_path=old_art_path)
+                    else:
+                        # The snapshot is gone; leave the file's current art alone
+                        raise FileNotFoundError('Stored album art is no longer available')
                     files_updated += 1
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.DELETE_FIELD:
             # Undo field deletion by restoring the field
@@ -1137,11 +1374,11 @@ def undo_action(action_id):
                 apply_metadata_to_file(filepath, {field: old_value})
                 files_updated += 1
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_DELETE_FIELD:
             # Undo batch field deletion by restoring fields
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     old_value = action.old_values.get(filepath, '')
                     if old_value:
@@ -1149,7 +1386,7 @@ def undo_action(action_id):
                         if success:
                             files_updated += 1
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.CREATE_FIELD:
             # Undo field creation by deleting the field
@@ -1161,21 +1398,21 @@ def undo_action(action_id):
                 if success:
                     files_updated += 1
                 else:
-                    errors.append(f"{os.path.basename(filepath)}: Failed to delete field")
+                    errors.append(f"{basenames[filepath]}: Failed to delete field")
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_CREATE_FIELD:
             # Undo batch field creation
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     success = mutagen_handler.delete_field(filepath, action.field)
                     if success:
                         files_updated += 1
                     else:
-                        errors.append(f"{os.path.basename(filepath)}: Failed to delete field")
+                        errors.append(f"{basenames[filepath]}: Failed to delete field")
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
 
         # Mark as undone
         action.is_undone = True
@@ -1216,6 +1453,10 @@ def redo_action(action_id):
     try:
         errors = []
         files_updated = 0
+        # Display names for error messages, computed once per action
+        basenames = {filepath: os.path.basename(filepath) for filepath in action.files}
+        # Each file is written at most once, even if the action lists it twice
+        unique_files = list(dict.fromkeys(action.files))
         
         if action.action_type in [ActionType.METADATA_CHANGE, ActionType.CLEAR_FIELD]:
             # Redo single metadata change or field clear
@@ -1227,17 +1468,21 @@ def redo_action(action_id):
                 apply_metadata_to_file(filepath, {field: new_value})
                 files_updated += 1
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_METADATA:
             # Redo batch metadata changes
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     new_value = action.new_values.get(filepath, '')
+                    if new_value == action.old_values.get(filepath, ''):
+                        # Unchanged by the action: count as updated, but skip the rewrite
+                        files_updated += 1
+                        continue
                     apply_metadata_to_file(filepath, {action.field: new_value})
                     files_updated += 1
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
 
         elif action.action_type in [ActionType.ALBUM_ART_CHANGE, ActionType.ALBUM_ART_DELETE]:
             # Redo album art change
@@ -1245,34 +1490,34 @@ def redo_action(action_id):
             new_art_path = action.new_values[filepath]
             
             try:
-                if new_art_path:
-                    new_art = history.load_album_art(new_art_path)
-                    if new_art:
-                        apply_metadata_to_file(filepath, {}, new_art)
-                    else:
-                        apply_metadata_to_file(filepath, {}, remove_art=True)
-                else:
+                if not new_art_path:
+                    # No art was stored for this state, so the file had none
                     apply_metadata_to_file(filepath, {}, remove_art=True)
+                elif os.path.exists(new_art_path):
+                    apply_metadata_to_file(filepath, {}, art_path=new_art_path)
+                else:
+                    # The snapshot is gone; leave the file's current art alone
+                    raise FileNotFoundError('Stored album art is no longer available')
                 files_updated += 1
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_ALBUM_ART:
             # Redo batch album art changes
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     new_art_path = action.new_values.get(filepath, '')
-                    if new_art_path:
-                        new_art = history.load_album_art(new_art_path)
-                        if new_art:
-                            apply_metadata_to_file(filepath, {}, new_art)
-                        else:
-                            apply_metadata_to_file(filepath, {}, remove_art=True)
-                    else:
+                    if not new_art_path:
+                        # No art was stored for this state, so the file had none
                         apply_metadata_to_file(filepath, {}, remove_art=True)
+                    elif os.path.exists(new_art_path):
+                        apply_metadata_to_file(filepath, {}, art_path=new_art_path)
+                    else:
+                        # The snapshot is gone; leave the file's current art alone
+                        raise FileNotFoundError('Stored album art is no longer available')
                     files_updated += 1
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.DELETE_FIELD:
             # Redo field deletion by deleting the field again
@@ -1283,17 +1528,17 @@ def redo_action(action_id):
                 mutagen_handler.delete_field(filepath, field)
                 files_updated += 1
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_DELETE_FIELD:
             # Redo batch field deletion
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     success = mutagen_handler.delete_field(filepath, action.field)
                     if success:
                         files_updated += 1
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.CREATE_FIELD:
             # Redo field creation
@@ -1315,13 +1560,13 @@ def redo_action(action_id):
                 if success:
                     files_updated += 1
                 else:
-                    errors.append(f"{os.path.basename(filepath)}: Failed to recreate field")
+                    errors.append(f"{basenames[filepath]}: Failed to recreate field")
             except Exception as e:
-                errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                errors.append(f"{basenames[filepath]}: {e}")
         
         elif action.action_type == ActionType.BATCH_CREATE_FIELD:
             # Redo batch field creation
-            for filepath in action.files:
+            for filepath in unique_files:
                 try:
                     value = action.new_values.get(filepath, '')
                     field = action.field
@@ -1338,9 +1583,9 @@ def redo_action(action_id):
                     if success:
                         files_updated += 1
                     else:
-                        errors.append(f"{os.path.basename(filepath)}: Failed to recreate field")
+                        errors.append(f"{basenames[filepath]}: Failed to recreate field")
                 except Exception as e:
-                    errors.append(f"{os.path.basename(filepath)}: {str(e)}")
+                    errors.append(f"{basenames[filepath]}: {e}")
 
         # Mark as not undone
         action.is_undone = False
@@ -1385,6 +1630,30 @@ def clear_history():
 # INFERENCE ENDPOINT
 # ==================
 
+@lru_cache(maxsize=128)
+def _list_audio_siblings(folder_path, folder_mtime_ns):
+    """List audio files in a folder (cached until the folder's mtime changes)"""
+    sibling_files = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if is_audio_file(entry.name):
+                sibling_files.append((entry.name, entry.path))
+    return tuple(sibling_files)
+
+def get_inference_folder_context(filepath):
+    """Build the folder context (sibling audio files) used by the inference engine"""
+    folder_path = os.path.dirname(filepath)
+    sibling_files = []
+    try:
+        siblings = _list_audio_siblings(folder_path, os.stat(folder_path).st_mtime_ns)
+        sibling_files = [{'name': name, 'path': path} for name, path in siblings]
+    except OSError:
+        pass
+    
+    return {
+        'files': sibling_files
+    }
+
 @app.route('/infer/<path:filename>/<field>')
 def infer_metadata_field(filename, field):
     """Infer metadata suggestions for a specific field"""
@@ -1395,34 +1664,22 @@ def infer_metadata_field(filename, field):
             return jsonify({'error': 'File not found'}), 404
         
         # Validate field
-        valid_fields = ['title', 'artist', 'album', 'albumartist', 'date', 'genre', 'track', 'disc', 'composer']
-        if field not in valid_fields:
+        if field not in _VALID_INFER_FIELDS:
             return jsonify({'error': 'Invalid field'}), 400
         
         # Get existing metadata
         existing_metadata = read_metadata(filepath)
         
         # Get folder context (sibling files)
-        folder_path = os.path.dirname(filepath)
-        sibling_files = []
-        try:
-            for fn in os.listdir(folder_path):
-                if fn.lower().endswith(AUDIO_EXTENSIONS):
-                    sibling_files.append({'name': fn, 'path': os.path.join(folder_path, fn)})
-        except:
-            pass
-        
-        folder_context = {
-            'files': sibling_files
-        }
+        folder_context = get_inference_folder_context(filepath)
         
         # Run inference
-        suggestions = inference_engine.infer_field(filepath, field, existing_metadata, folder_context)
+        suggestions = inference_engine.infer_field(filepath, field, existing_metadata, folder_context, top_k=5)
         
         # Format response
         return jsonify({
             'field': field,
-            'suggestions': suggestions[:5]  # Limit to top 5
+            'suggestions': suggestions
         })
         
     except ValueError:
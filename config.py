@@ -68,7 +68,15 @@ FORMAT_METADATA_CONFIG = {
 }
 
 # History configuration
-MAX_HISTORY_ITEMS = 1000
+MAX_HISTORY_ITEMS = int(os.environ.get('MAX_HISTORY_ITEMS', '1000'))
+MAX_HISTORY_BYTES = int(os.environ.get('MAX_HISTORY_BYTES', str(256 * 1024 * 1024)))  # 256 MiB
+
+# Batch processing configuration (files processed concurrently in folder operations)
+# Defaults to half the CPUs so a large batch doesn't saturate the host
+BATCH_MAX_WORKERS = max(1, int(os.environ.get('BATCH_MAX_WORKERS', str((os.cpu_count() or 1) // 2))))
+
+# Metadata read cache configuration (entries keyed by path, mtime and size)
+METADATA_CACHE_SIZE = int(os.environ.get('METADATA_CACHE_SIZE', '4096'))
 
 # Inference engine configuration
 INFERENCE_CACHE_DURATION = 3600  # 1 hour
@@ -24,8 +24,9 @@ from config import logger
 from core.history import (
     history, create_album_art_action, create_batch_album_art_action
 )
-from core.album_art.extractor import extract_album_art
+from core.album_art.extractor import extract_album_art_bytes
 from core.metadata.writer import apply_metadata_to_file
+from core.batch.processor import scan_files
 
 def save_album_art_to_file(filepath, art_data=None, remove_art=False, metadata_tags=None, track_history=True):
     """
@@ -33,7 +34,7 @@ def save_album_art_to_file(filepath, art_data=None, remove_art=False, metadata_t
     
     Args:
         filepath: Path to the audio file
-        art_data: Base64 encoded album art data (optional)
+        art_data: Base64 encoded album art data or raw image bytes (optional)
         remove_art: Whether to remove existing album art
         metadata_tags: Additional metadata to save along with album art
         track_history: Whether to track this change in history
@@ -47,7 +48,7 @@ def save_album_art_to_file(filepath, art_data=None, remove_art=False, metadata_t
         new_art_path = ''
         
         if track_history:
-            current_art = extract_album_art(filepath)
+            current_art = extract_album_art_bytes(filepath)
             # Save to history's temporary storage
             old_art_path = history.save_album_art(current_art) if current_art else ''
             new_art_path = history.save_album_art(art_data) if art_data else ''
@@ -84,7 +85,7 @@ def process_album_art_change(filepath, data, current_metadata):
         current_metadata: Current metadata including album art
         
     Returns:
-        tuple: (has_art_change: bool, art_data: str or None, remove_art: bool)
+        tuple: (has_art_change: bool, art_data: str, bytes or None, remove_art: bool)
     """
     art_data = data.get('art')
     remove_art = data.get('removeArt', False)
@@ -104,20 +105,19 @@ def prepare_batch_album_art_change(folder_path, art_data, audio_files):
         audio_files: List of audio file paths
         
     Returns:
-        list: List of tuples (filepath, current_art) for history tracking
+        list: List of tuples (filepath, current_art) for history tracking, with
+            current_art as raw image bytes
     """
-    file_changes = []
-    
-    for file_path in audio_files:
+    def current_art(file_path):
         try:
-            current_art = extract_album_art(file_path)
-            file_changes.append((file_path, current_art))
+            return extract_album_art_bytes(file_path)
         except Exception as e:
             logger.warning(f"Could not extract current art from {file_path}: {e}")
             # Still include the file with None for current art
-            file_changes.append((file_path, None))
+            return None
     
-    return file_changes
+    # Read the files concurrently; results come back in input order
+    return list(zip(audio_files, scan_files(audio_files, current_art)))
 
 def record_batch_album_art_history(folder_path, art_data, file_changes):
     """
@@ -134,9 +134,9 @@ def record_batch_album_art_history(folder_path, art_data, file_changes):
     # Create batch action
     action = create_batch_album_art_action(folder_path, art_data, file_changes)
     
-    # Update the action with saved art paths
-    for filepath, old_art in file_changes:
-        old_art_path = history.save_album_art(old_art) if old_art else ''
+    # Write the old art files concurrently, then update the action with their paths
+    old_art_paths = scan_files([old_art for _, old_art in file_changes], history.save_album_art)
+    for (filepath, _), old_art_path in zip(file_changes, old_art_paths):
         action.old_values[filepath] = old_art_path
         action.new_values[filepath] = new_art_path
     
@@ -40,11 +40,11 @@ class OggAlbumArtHandler:
             str: 'vorbis' or 'opus'
         """
         try:
-            from mutagen import File
             from mutagen.oggvorbis import OggVorbis
             from mutagen.oggopus import OggOpus
             
-            audio_file = File(filepath)
+            # Reuse the handler's parse, cached until the file changes
+            audio_file, _ = mutagen_handler.detect_format_for_read(filepath)
             if isinstance(audio_file, OggOpus):
                 return 'opus'
             elif isinstance(audio_file, OggVorbis):
@@ -110,14 +110,13 @@ class OggAlbumArtHandler:
             bool: True if album art exists
         """
         try:
-            art = mutagen_handler.get_album_art(filepath)
-            return art is not None
+            return mutagen_handler.has_album_art(filepath)
         except:
             return False
     
     def _detect_mime_type(self, image_data: bytes) -> str:
         """Detect MIME type from image data"""
-        return mutagen_handler._detect_mime_type(image_data)
+        return mutagen_handler.detect_mime_type(image_data)
 
 
 # Global instance for reuse
@@ -19,21 +19,76 @@ Album art processing and corruption handling for Metadata Remote
 Handles detection and repair of corrupted album artwork
 """
 import os
-import base64
+import hashlib
 import logging
-import mutagen
+import threading
+from collections import OrderedDict
 from PIL import Image
 from io import BytesIO
+from mutagen.flac import FLAC
+from mutagen.oggvorbis import OggVorbis
+from mutagen.oggopus import OggOpus
+from mutagen.mp3 import MP3
+from mutagen.mp4 import MP4
+from mutagen.asf import ASF
+
+try:
+    from pybase64 import b64decode
+except ImportError:  # Fall back to the standard library decoder
+    from base64 import b64decode
 
 from config import logger, FORMAT_METADATA_CONFIG
 from core.file_utils import get_file_format
 from core.metadata.mutagen_handler import mutagen_handler
 
+def _rfind_tail(data, marker, tail_size):
+    """
+    Find the last occurrence of an end marker, searching the tail first
+    
+    Args:
+        data: Image bytes
+        marker: End marker to look for
+        tail_size: Number of trailing bytes a well-formed image keeps the marker in
+        
+    Returns:
+        int: Offset of the last marker, or -1 if there is none
+    """
+    end_pos = data.rfind(marker, max(0, len(data) - tail_size))
+    if end_pos < 0:
+        # Not near the end: only images with trailing data need the full scan
+        end_pos = data.rfind(marker)
+    return end_pos
+
+# Validation results keyed by a 16-byte digest of the image, so the memo holds
+# no image data and a lookup never compares whole images
+_VALIDATION_CACHE_SIZE = 256
+_validation_cache = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
 def _validate_image_data(image_bytes):
     """
     Validate image data more thoroughly, including checking for trailing garbage.
     Returns True if corrupted, False if valid.
+    
+    Results are memoised by image digest: a folder batch usually carries the
+    same cover in every file, so the full decode runs once instead of per file.
     """
+    key = hashlib.blake2b(image_bytes, digest_size=16).digest()
+    with _validation_cache_lock:
+        corrupted = _validation_cache.get(key)
+        if corrupted is not None:
+            _validation_cache.move_to_end(key)
+            return corrupted
+    
+    corrupted = _check_image_data(image_bytes)
+    with _validation_cache_lock:
+        _validation_cache[key] = corrupted
+        while len(_validation_cache) > _VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+    return corrupted
+
+def _check_image_data(image_bytes):
+    """Decode and inspect image data; True if corrupted"""
     try:
         # First try basic PIL validation
         img = Image.open(BytesIO(image_bytes))
@@ -53,9 +108,9 @@ def _validate_image_data(image_bytes):
         format_lower = img.format.lower() if img.format else ''
         
         if format_lower == 'jpeg':
-            # Find JPEG end marker
+            # Find JPEG end marker, looking in the tail first where a valid one sits
             end_marker = b'\xff\xd9'
-            end_pos = image_bytes.find(end_marker)
+            end_pos = _rfind_tail(image_bytes, end_marker, 64)
             if end_pos >= 0:
                 actual_end = end_pos + 2
                 if actual_end < len(image_bytes) - 2:  # Allow 2 bytes padding
@@ -64,7 +119,7 @@ def _validate_image_data(image_bytes):
         elif format_lower == 'png':
             # PNG ends with IEND chunk
             iend_marker = b'IEND'
-            end_pos = image_bytes.rfind(iend_marker)
+            end_pos = _rfind_tail(image_bytes, iend_marker, 32)
             if end_pos >= 0:
                 # IEND chunk is 12 bytes total (4 length + 4 'IEND' + 4 CRC)
                 actual_end = end_pos + 8  # 4 for 'IEND' + 4 for CRC
@@ -79,19 +134,12 @@ def _validate_image_data(image_bytes):
 def detect_corrupted_album_art(filepath):
     """Detect if album art in the file is corrupted using Mutagen"""
     try:
-        # Open file with Mutagen to access format-specific data
-        audio = mutagen.File(filepath)
+        # Open file with Mutagen to access format-specific data (read-only, so the
+        # parse is shared with metadata reads of the same file version)
+        audio, _ = mutagen_handler.detect_format_for_read(filepath)
         if audio is None:
             return False
             
-        # Import format classes
-        from mutagen.flac import FLAC
-        from mutagen.oggvorbis import OggVorbis
-        from mutagen.oggopus import OggOpus
-        from mutagen.mp3 import MP3
-        from mutagen.mp4 import MP4
-        from mutagen.asf import ASF
-
         # FLAC-specific validation
         if isinstance(audio, FLAC):
             if not audio.pictures:
@@ -113,14 +161,15 @@ def detect_corrupted_album_art(filepath):
 
         # OGG/Opus-specific validation
         elif isinstance(audio, (OggVorbis, OggOpus)):
-            if 'METADATA_BLOCK_PICTURE' not in audio:
+            pictures = audio.get('METADATA_BLOCK_PICTURE')
+            if not pictures:
                 return False
                 
-            for pic_data in audio['METADATA_BLOCK_PICTURE']:
+            for pic_data in pictures:
                 try:
                     # Validate base64 encoding
                     try:
-                        decoded = base64.b64decode(pic_data, validate=True)
+                        decoded = b64decode(pic_data, validate=True)
                     except Exception:
                         return True  # Invalid base64
                     
@@ -143,14 +192,11 @@ def detect_corrupted_album_art(filepath):
         # For other formats, try extraction-based validation
         else:
             try:
-                art_data = mutagen_handler.get_album_art(filepath)
+                image_bytes = mutagen_handler.get_album_art_bytes(filepath)
                 
-                if not art_data:
+                if not image_bytes:
                     return False
                 
-                # Decode and validate
-                image_bytes = base64.b64decode(art_data)
-                
                 # Use enhanced validation
                 return _validate_image_data(image_bytes)
                 
@@ -177,7 +223,7 @@ def fix_corrupted_album_art(filepath):
         # First try to extract any salvageable art
         existing_art = None
         try:
-            existing_art = mutagen_handler.get_album_art(filepath)
+            existing_art = mutagen_handler.get_album_art_bytes(filepath)
         except:
             pass
 
@@ -192,8 +238,7 @@ def fix_corrupted_album_art(filepath):
         if existing_art:
             try:
                 # Validate the salvaged art
-                image_bytes = base64.b64decode(existing_art)
-                img = Image.open(BytesIO(image_bytes))
+                img = Image.open(BytesIO(existing_art))
                 img.verify()
 
                 # Re-embed the validated art
@@ -20,12 +20,109 @@ Handles bulk operations on all files in a folder
 """
 import os
 import logging
-from flask import jsonify
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Response, current_app, jsonify, stream_with_context
 
-from config import MUSIC_DIR, AUDIO_EXTENSIONS, logger
-from core.file_utils import validate_path
+from config import MUSIC_DIR, BATCH_MAX_WORKERS, logger
+from core.file_utils import validate_path, list_audio_files
 
-def process_folder_files(folder_path, process_func, process_name):
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    """
+    Return the long-lived thread pool shared by all batch operations
+    
+    Worker threads are started on first use and reused across requests
+    instead of being spawned and joined for every folder operation.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS,
+                                               thread_name_prefix='batch')
+    return _executor
+
+def scan_files(file_paths, scan_func):
+    """
+    Run a read-only scan over a list of files concurrently
+    
+    Args:
+        file_paths: List of absolute file paths
+        scan_func: Function called with each file path; its return value is collected
+        
+    Returns:
+        List of scan_func results in the order of file_paths. An exception raised
+        by scan_func propagates to the caller.
+    """
+    return list(_get_executor().map(scan_func, file_paths))
+
+def scan_audio_files(folder_path, scan_func):
+    """
+    Run a read-only scan over every audio file in a folder concurrently
+    
+    Args:
+        folder_path: Absolute path of the folder
+        scan_func: Function called with each file path; its return value is collected
+        
+    Returns:
+        List of (file_path, result) tuples in folder order. An exception raised
+        by scan_func propagates to the caller.
+    """
+    audio_files = list_audio_files(folder_path)
+    return list(zip(audio_files, scan_files(audio_files, scan_func)))
+
+def _process_file(process_func, file_path):
+    """
+    Run process_func on a single file
+    
+    Returns:
+        None on success, or an error message for the file
+    """
+    filename = os.path.basename(file_path)
+    try:
+        process_func(file_path)
+        return None
+    except Exception as e:
+        logger.error(f"Error processing {filename}: {e}")
+        return f"{filename}: {str(e)}"
+
+def _summarize(errors, total, process_name, on_complete):
+    """
+    Build the final batch result and run the completion hook
+    
+    Returns:
+        Tuple of (result dict, HTTP status code)
+    """
+    files_updated = total - len(errors)
+    
+    if files_updated == 0:
+        return {
+            'status': 'error',
+            'error': f'No files were {process_name}',
+            'errors': errors
+        }, 500
+    
+    if errors:
+        result = {
+            'status': 'partial',
+            'filesUpdated': files_updated,
+            'errors': errors
+        }
+    else:
+        result = {
+            'status': 'success',
+            'filesUpdated': files_updated
+        }
+    
+    # Callers record history or add fields once at least one file changed
+    if on_complete:
+        on_complete(result)
+    return result, 200
+
+def process_folder_files(folder_path, process_func, process_name, stream=False, on_complete=None):
     """
     Generic function to process all audio files in a folder
     
@@ -33,9 +130,15 @@ def process_folder_files(folder_path, process_func, process_name):
         folder_path: Path to the folder containing audio files
         process_func: Function to call for each file (takes file_path as argument)
         process_name: Human-readable name of the process for status messages
+        stream: Stream NDJSON progress, one line per file, instead of a single JSON body
+        on_complete: Function called with the result dict when at least one file
+            was updated; it may add fields to the result
         
     Returns:
-        Flask JSON response with status and results
+        Flask JSON response with status and results. When streaming, the body is
+        a {"total": n} line, a {"file", "status"[, "error"]} line per file in the
+        order they finish and the result dict as the last line. If the client
+        disconnects, the batch still completes and on_complete still runs.
     """
     try:
         abs_folder_path = validate_path(os.path.join(MUSIC_DIR, folder_path) if folder_path else MUSIC_DIR)
@@ -44,46 +147,56 @@ def process_folder_files(folder_path, process_func, process_name):
             return jsonify({'error': 'Folder not found'}), 404
         
         # Get all audio files in the folder (not subfolders)
-        audio_files = []
-        for filename in os.listdir(abs_folder_path):
-            file_path = os.path.join(abs_folder_path, filename)
-            if os.path.isfile(file_path) and filename.lower().endswith(AUDIO_EXTENSIONS):
-                audio_files.append(file_path)
+        audio_files = list_audio_files(abs_folder_path)
         
         if not audio_files:
             return jsonify({'error': 'No audio files found in folder'}), 404
         
-        files_updated = 0
-        errors = []
+        # Process files concurrently
+        executor = _get_executor()
+        
+        if stream:
+            def generate():
+                dumpb = current_app.json.dumpb
+                futures = {executor.submit(_process_file, process_func, file_path): file_path
+                           for file_path in audio_files}
+                errors = []
+                summarized = False
+                try:
+                    yield dumpb({'total': len(audio_files)}) + b'\n'
+                    try:
+                        # Report each file as soon as it finishes, whatever its position
+                        for future in as_completed(futures):
+                            error = future.result()
+                            line = {'file': os.path.basename(futures[future]), 'status': 'ok'}
+                            if error:
+                                errors.append(error)
+                                line['status'] = 'error'
+                                line['error'] = error
+                            yield dumpb(line) + b'\n'
+                        summarized = True
+                        result, _ = _summarize(errors, len(audio_files), process_name, on_complete)
+                    except Exception as e:
+                        logger.error(f"Error {process_name} folder: {str(e)}")
+                        result = {'status': 'error', 'error': str(e), 'errors': errors}
+                    yield dumpb(result) + b'\n'
+                finally:
+                    if not summarized:
+                        # The client went away mid-batch; the submitted files are
+                        # still written, so wait for them and record history anyway
+                        errors = [error for error in (future.result() for future in futures) if error]
+                        try:
+                            _summarize(errors, len(audio_files), process_name, on_complete)
+                        except Exception as e:
+                            logger.error(f"Error {process_name} folder: {str(e)}")
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
         
-        # Process each file
-        for file_path in audio_files:
-            filename = os.path.basename(file_path)
-            try:
-                process_func(file_path)
-                files_updated += 1
-            except Exception as e:
-                logger.error(f"Error processing {filename}: {e}")
-                errors.append(f"{filename}: {str(e)}")
+        results = list(executor.map(lambda file_path: _process_file(process_func, file_path), audio_files))
         
-        # Return results
-        if files_updated == 0:
-            return jsonify({
-                'status': 'error',
-                'error': f'No files were {process_name}',
-                'errors': errors
-            }), 500
-        elif errors:
-            return jsonify({
-                'status': 'partial',
-                'filesUpdated': files_updated,
-                'errors': errors
-            })
-        else:
-            return jsonify({
-                'status': 'success',
-                'filesUpdated': files_updated
-            })
+        errors = [error for error in results if error]
+        result, status_code = _summarize(errors, len(results), process_name, on_complete)
+        return jsonify(result), status_code
             
     except ValueError:
         return jsonify({'error': 'Invalid path'}), 403
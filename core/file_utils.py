@@ -19,18 +19,53 @@ File system utilities for Metadata Remote
 Handles path validation, file ownership, and format detection
 """
 import os
+import atexit
+import queue
 import logging
+import threading
 from pathlib import Path
 
-from config import MUSIC_DIR, OWNER_UID, OWNER_GID, FORMAT_METADATA_CONFIG, logger
+from config import MUSIC_DIR, OWNER_UID, OWNER_GID, AUDIO_EXTENSIONS, FORMAT_METADATA_CONFIG, logger
+
+# Resolved once at import; the trailing separator keeps e.g. /music-evil
+# from passing a prefix check against /music
+_MUSIC_DIR_ABS = os.path.abspath(MUSIC_DIR)
+_MUSIC_DIR_PREFIX = os.path.join(_MUSIC_DIR_ABS, '')
 
 def validate_path(filepath):
     """Validate that a path is within MUSIC_DIR"""
     abs_path = os.path.abspath(filepath)
-    if not abs_path.startswith(os.path.abspath(MUSIC_DIR)):
+    if abs_path != _MUSIC_DIR_ABS and not abs_path.startswith(_MUSIC_DIR_PREFIX):
         raise ValueError("Invalid path")
     return abs_path
 
+_AUDIO_EXT_SET = frozenset(ext.lower() for ext in AUDIO_EXTENSIONS)
+
+def is_audio_file(filename):
+    """Check whether a file name has a supported audio extension"""
+    i = filename.rfind('.')
+    return i >= 0 and filename[i:].lower() in _AUDIO_EXT_SET
+
+def list_audio_files(folder_path):
+    """
+    List audio files directly inside a folder (not subfolders)
+    
+    Uses os.scandir so the file type check comes from the directory entry
+    instead of a separate stat() call per file.
+    
+    Args:
+        folder_path: Absolute path of the folder
+        
+    Returns:
+        List of absolute audio file paths, in directory order
+    """
+    audio_files = []
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            if entry.is_file() and is_audio_file(entry.name):
+                audio_files.append(entry.path)
+    return audio_files
+
 def fix_file_ownership(filepath):
     """Fix file ownership to match Jellyfin's expected user"""
     try:
@@ -39,9 +74,74 @@ def fix_file_ownership(filepath):
     except Exception as e:
         logger.warning(f"Could not fix ownership of {filepath}: {e}")
 
+_ownership_queue = queue.Queue(maxsize=10000)
+_ownership_worker = None
+_ownership_worker_lock = threading.Lock()
+
+def _ownership_worker_loop():
+    while True:
+        filepath = _ownership_queue.get()
+        try:
+            fix_file_ownership(filepath)
+        finally:
+            _ownership_queue.task_done()
+
+def queue_file_ownership_fix(filepath):
+    """
+    Fix file ownership on a background thread
+    
+    Keeps the chown() off the request path; ownership is corrected shortly
+    after the write completes.
+    
+    Args:
+        filepath: Path of the file or folder to chown
+    """
+    global _ownership_worker
+    if _ownership_worker is None:
+        with _ownership_worker_lock:
+            if _ownership_worker is None:
+                _ownership_worker = threading.Thread(
+                    target=_ownership_worker_loop, name='ownership-fixer', daemon=True
+                )
+                _ownership_worker.start()
+    try:
+        _ownership_queue.put_nowait(filepath)
+    except queue.Full:
+        # Don't block the request on a backlog; fix this one inline instead
+        fix_file_ownership(filepath)
+
+def drain_ownership_queue():
+    """
+    Apply any ownership fixes still queued for the background thread
+    
+    The worker is a daemon thread, so it is killed at process exit. This runs
+    at interpreter exit and from gunicorn's worker_exit hook so worker restarts
+    don't leave files with the wrong owner.
+    """
+    while True:
+        try:
+            filepath = _ownership_queue.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            fix_file_ownership(filepath)
+        finally:
+            _ownership_queue.task_done()
+    # Wait for the fix the worker thread may be in the middle of
+    _ownership_queue.join()
+
+atexit.register(drain_ownership_queue)
+
 def get_file_format(filepath):
     """Get file format and metadata tag case preference"""
-    ext = os.path.splitext(filepath.lower())[1]
+    ext = os.path.splitext(filepath)[1].lower()
+    file_format = _FORMAT_BY_EXT.get(ext)
+    if file_format is None:
+        file_format = _format_for_extension(ext)
+    return file_format
+
+def _format_for_extension(ext):
+    """Resolve (output_format, use_uppercase, base_format) for an extension"""
     base_format = ext[1:]  # Remove the dot
     
     # Determine the container format for output
@@ -64,3 +164,6 @@ def get_file_format(filepath):
     use_uppercase = base_format in FORMAT_METADATA_CONFIG.get('uppercase', [])
     
     return output_format, use_uppercase, base_format
+
+# (output_format, use_uppercase, base_format) for every supported extension, built once
+_FORMAT_BY_EXT = {ext: _format_for_extension(ext) for ext in _AUDIO_EXT_SET}
@@ -20,16 +20,17 @@ Editing history system for tracking and reverting changes
 import os
 import time
 import uuid
-import base64
+import binascii
 import hashlib
 import logging
 import tempfile
 import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union
 
-from config import MAX_HISTORY_ITEMS, logger
+from config import MAX_HISTORY_ITEMS, MAX_HISTORY_BYTES, logger
 
 # ======================
 # EDITING HISTORY SYSTEM
@@ -74,6 +75,17 @@ class HistoryAction:
             'file_count': len(self.files)
         }
     
+    def to_summary(self):
+        """Convert to a compact dictionary for history listings (no file paths)"""
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp,
+            'action_type': self.action_type.value,
+            'description': self.description,
+            'is_undone': self.is_undone,
+            'file_count': len(self.files)
+        }
+    
     def get_details(self):
         """Get detailed information about the action"""
         details = self.to_dict()
@@ -97,91 +109,165 @@ class HistoryAction:
             
         return details
 
+def _art_temp_parent() -> Optional[str]:
+    """
+    Pick where album art snapshots are stored
+    
+    Prefers memory-backed /dev/shm when it can hold a full history's worth
+    of art, so snapshots and undo reads never touch slow storage.
+    
+    Returns:
+        Directory path, or None for the system default temp directory
+    """
+    try:
+        st = os.statvfs('/dev/shm')
+    except (OSError, AttributeError):
+        return None
+    if st.f_bavail * st.f_frsize >= MAX_HISTORY_BYTES:
+        return '/dev/shm'
+    return None
+
 class EditingHistory:
     """Manages the editing history for the application"""
     
     def __init__(self):
-        self.actions: List[HistoryAction] = []
+        # Keyed by action ID, kept in chronological order
+        self.actions: Dict[str, HistoryAction] = OrderedDict()
         self.lock = threading.Lock()
         
+        # Approximate memory/disk footprint used to bound the history size
+        self._action_sizes: Dict[str, int] = {}
+        self._total_bytes = 0
+        
+        # Art snapshots are content-addressed and shared between actions (one
+        # action's new art is the next one's old art), so each file is counted
+        # once and deleted only when no remaining action references it
+        self._art_refs: Dict[str, int] = {}
+        self._art_sizes: Dict[str, int] = {}
+        
         # Create temp directory for storing album art
-        self.temp_dir = tempfile.mkdtemp(prefix='metadata_remote_history_')
+        self.temp_dir = tempfile.mkdtemp(prefix='metadata_remote_history_', dir=_art_temp_parent())
         logger.info(f"Created temp directory for history: {self.temp_dir}")
     
     def add_action(self, action: HistoryAction):
         """Add a new action to the history"""
         with self.lock:
-            self.actions.append(action)
-            # Keep only last N actions to prevent memory issues
-            if len(self.actions) > MAX_HISTORY_ITEMS:
-                # Clean up old album art files if any
-                old_action = self.actions.pop(0)
+            self.actions[action.id] = action
+            size = self._estimate_action_size(action)
+            self._action_sizes[action.id] = size
+            self._total_bytes += size
+            self._acquire_art_files(action)
+            
+            # Evict the oldest actions once either the count or size limit is
+            # exceeded, always keeping the newest action
+            while len(self.actions) > 1 and (
+                    len(self.actions) > MAX_HISTORY_ITEMS or self._total_bytes > MAX_HISTORY_BYTES):
+                _, old_action = self.actions.popitem(last=False)
+                self._total_bytes -= self._action_sizes.pop(old_action.id, 0)
+                # Clean up album art files no other action still uses
                 self._cleanup_action_files(old_action)
     
-    def get_all_actions(self):
-        """Get all actions in reverse chronological order"""
+    def _estimate_action_size(self, action: HistoryAction) -> int:
+        """Approximate the bytes held by an action itself, excluding shared album art files"""
+        size = sum(len(filepath) for filepath in action.files)
+        for values in (action.old_values, action.new_values):
+            for filepath, value in values.items():
+                size += len(filepath) + len(str(value))
+        return size
+    
+    @staticmethod
+    def _art_paths(action: HistoryAction) -> set:
+        """Album art snapshot files referenced by an action"""
+        if action.action_type not in [ActionType.ALBUM_ART_CHANGE, ActionType.ALBUM_ART_DELETE, ActionType.BATCH_ALBUM_ART]:
+            return set()
+        return {art_path for values in (action.old_values, action.new_values)
+                for art_path in values.values() if art_path}
+    
+    def _acquire_art_files(self, action: HistoryAction):
+        """Take a reference on an action's art files, counting each file's size once"""
+        for art_path in self._art_paths(action):
+            refs = self._art_refs.get(art_path, 0)
+            if refs == 0:
+                try:
+                    art_size = os.path.getsize(art_path)
+                except OSError:
+                    art_size = 0
+                self._art_sizes[art_path] = art_size
+                self._total_bytes += art_size
+            self._art_refs[art_path] = refs + 1
+    
+    def get_all_actions(self, summary: bool = False):
+        """Get all actions in reverse chronological order
+        
+        Args:
+            summary: If True, return compact summaries without file lists
+        """
         with self.lock:
-            return [action.to_dict() for action in reversed(self.actions)]
+            if summary:
+                return [action.to_summary() for action in reversed(self.actions.values())]
+            return [action.to_dict() for action in reversed(self.actions.values())]
+    
+    def iter_actions(self, summary: bool = False):
+        """Yield serializable actions one at a time in reverse chronological order
+        
+        Only the list of action references is copied under the lock, so
+        callers can stream the history without building every dict up front.
+        
+        Args:
+            summary: If True, yield compact summaries without file lists
+        """
+        with self.lock:
+            snapshot = list(reversed(self.actions.values()))
+        for action in snapshot:
+            yield action.to_summary() if summary else action.to_dict()
     
     def get_action(self, action_id: str) -> Optional[HistoryAction]:
         """Get a specific action by ID"""
         with self.lock:
-            for action in self.actions:
-                if action.id == action_id:
-                    return action
-            return None
+            return self.actions.get(action_id)
     
-    def save_album_art(self, art_data: str) -> str:
-        """Save album art to temp file and return the path"""
+    def save_album_art(self, art_data: Union[str, bytes]) -> str:
+        """Save album art (base64/data URI or raw image bytes) to temp file and return the path"""
         if not art_data:
             return ''
         
         # Generate unique filename
-        art_hash = hashlib.md5(art_data.encode()).hexdigest()
+        art_hash = hashlib.md5(art_data if isinstance(art_data, bytes) else art_data.encode()).hexdigest()
         art_path = os.path.join(self.temp_dir, f"{art_hash}.jpg")
         
-        # Save only if not already exists
-        if not os.path.exists(art_path):
-            try:
-                # Decode base64 data
-                art_bytes = base64.b64decode(art_data.split(',')[1] if ',' in art_data else art_data)
-                with open(art_path, 'wb') as f:
-                    f.write(art_bytes)
-            except Exception as e:
-                logger.error(f"Error saving album art: {e}")
-                return ''
-        
-        return art_path
-    
-    def load_album_art(self, art_path: str) -> Optional[str]:
-        """Load album art from temp file"""
-        if not art_path or not os.path.exists(art_path):
-            return None
-        
+        # Save only if not already exists; exclusive create makes the check and open one call
         try:
-            with open(art_path, 'rb') as f:
-                art_bytes = f.read()
-            return f"data:image/jpeg;base64,{base64.b64encode(art_bytes).decode()}"
+            with open(art_path, 'xb') as f:
+                try:
+                    if isinstance(art_data, bytes):
+                        f.write(art_data)
+                    else:
+                        # Decode base64 data
+                        f.write(binascii.a2b_base64(art_data.split(',')[1] if ',' in art_data else art_data))
+                except Exception:
+                    os.remove(art_path)
+                    raise
+        except FileExistsError:
+            pass
         except Exception as e:
-            logger.error(f"Error loading album art: {e}")
-            return None
+            logger.error(f"Error saving album art: {e}")
+            return ''
+        
+        return art_path
     
     def _cleanup_action_files(self, action: HistoryAction):
-        """Clean up any temporary files associated with an action"""
-        if action.action_type in [ActionType.ALBUM_ART_CHANGE, ActionType.ALBUM_ART_DELETE, ActionType.BATCH_ALBUM_ART]:
-            # Clean up old album art files
-            for art_path in action.old_values.values():
-                if art_path and os.path.exists(art_path):
-                    try:
-                        os.remove(art_path)
-                    except:
-                        pass
-            for art_path in action.new_values.values():
-                if art_path and os.path.exists(art_path):
-                    try:
-                        os.remove(art_path)
-                    except:
-                        pass
+        """Release an action's album art files, deleting those no remaining action references"""
+        for art_path in self._art_paths(action):
+            refs = self._art_refs.get(art_path, 0) - 1
+            if refs > 0:
+                self._art_refs[art_path] = refs
+                continue
+            self._art_refs.pop(art_path, None)
+            self._total_bytes -= self._art_sizes.pop(art_path, 0)
+            try:
+                os.remove(art_path)
+            except OSError:
+                pass
     
     def __del__(self):
         """Clean up temp directory on exit"""
@@ -197,18 +283,22 @@ class EditingHistory:
         """Clear all history and clean up associated files"""
         with self.lock:
             # Clean up all temporary files
-            for action in self.actions:
+            for action in self.actions.values():
                 self._cleanup_action_files(action)
             
-            # Clear the actions list
+            # Clear the actions and their size accounting
             self.actions.clear()
+            self._action_sizes.clear()
+            self._art_refs.clear()
+            self._art_sizes.clear()
+            self._total_bytes = 0
             
             logger.info("Cleared all editing history")
 
     def update_file_references(self, old_path: str, new_path: str):
         """Update all actions that reference a file when it gets renamed"""
         with self.lock:
-            for action in self.actions:
+            for action in self.actions.values():
                 # Update files list
                 updated_files = []
                 for filepath in action.files:
@@ -19,22 +19,45 @@ Metadata inference engine for intelligent field suggestions
 """
 import re
 import time
+import heapq
 import hashlib
 import urllib.parse
 import urllib.request
 import urllib.error
-import json
 import threading
 from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
 from typing import List, Dict, Optional
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # The standard library parser also accepts bytes
+    from json import loads as json_loads
+
 from config import (
     INFERENCE_CACHE_DURATION, MUSICBRAINZ_RATE_LIMIT,
     MUSICBRAINZ_USER_AGENT, FIELD_THRESHOLDS, logger
 )
 
+# Filename patterns applied to every sibling file, compiled once
+_TRACK_PREFIX_RE = re.compile(r'^(\d{1,3})[\s\-_.]+')
+_TRACK_PREFIX_TITLE_RE = re.compile(r'^(\d{1,3})[\s\-_.]+(.+)')
+_TRACK_NUMBER_RE = re.compile(r'^\d{1,3}$')
+_PARENS_RE = re.compile(r'\(([^)]+)\)')
+_BRACKETS_RE = re.compile(r'\[([^\]]+)\]')
+_AUDIO_SUFFIX_RE = re.compile(r'\.(mp3|flac|m4a|wav|wma|wv)$', re.IGNORECASE)
+_LEADING_TRACK_CHARS_RE = re.compile(r'^[\d\s\-_.]+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_QUALITY_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\[?\d{3,4}kbps\]?',
+    r'\[?320\]?',
+    r'\[?FLAC\]?',
+    r'\[?MP3\]?',
+    r'\(Explicit\)',
+    r'\[Explicit\]',
+))
+
 # =========================
 # METADATA INFERENCE ENGINE
 # =========================
@@ -51,7 +74,7 @@ class MetadataInferenceEngine:
         # Confidence thresholds
         self.field_thresholds = FIELD_THRESHOLDS
         
-    def infer_field(self, file_path: str, field: str, existing_metadata: dict, folder_context: dict) -> List[dict]:
+    def infer_field(self, file_path: str, field: str, existing_metadata: dict, folder_context: dict, top_k: int = 5) -> List[dict]:
         """Main entry point for inferring a single field"""
         
         # Build evidence state
@@ -68,12 +91,16 @@ class MetadataInferenceEngine:
         # Phase 3: Synthesis
         all_candidates = self._synthesize_candidates(local_candidates, mb_candidates, evidence_state, field)
         
-        # Phase 4: Final scoring and sorting
+        # Phase 4: Final scoring
         final_candidates = self._calculate_final_scores(all_candidates, evidence_state, field)
         
         # Return top candidates with confidence >= threshold/2
         threshold = self.field_thresholds.get(field, 70) / 2
-        return [c for c in final_candidates if c['confidence'] >= threshold][:5]
+        return heapq.nlargest(
+            top_k,
+            (c for c in final_candidates if c['confidence'] >= threshold),
+            key=lambda x: x['confidence']
+        )
     
     def _build_evidence_state(self, file_path: str, existing_metadata: dict, folder_context: dict) -> dict:
         """Build comprehensive evidence state"""
@@ -123,8 +150,8 @@ class MetadataInferenceEngine:
                 })
         
         # Extract parenthetical info
-        paren_matches = re.findall(r'\(([^)]+)\)', name)
-        bracket_matches = re.findall(r'\[([^\]]+)\]', name)
+        paren_matches = _PARENS_RE.findall(name)
+        bracket_matches = _BRACKETS_RE.findall(name)
         
         for match in paren_matches + bracket_matches:
             segments.append({
@@ -186,7 +213,7 @@ class MetadataInferenceEngine:
             track_matches = []
             for fn in filenames + [current_file]:
                 # Match various track patterns
-                match = re.match(r'^(\d{1,3})[\s\-_.]+(.+)', fn)
+                match = _TRACK_PREFIX_TITLE_RE.match(fn)
                 if match:
                     track_matches.append(match.group(1))
             
@@ -225,7 +252,7 @@ class MetadataInferenceEngine:
             # Common patterns
             if len(parts) == 2:
                 # Assume "Artist - Title" or "Track - Title"
-                if re.match(r'^\d{1,3}$', parts[0].strip()):
+                if _TRACK_NUMBER_RE.match(parts[0].strip()):
                     # First part is track number
                     candidates.append({
                         'value': parts[1].strip(),
@@ -244,7 +271,7 @@ class MetadataInferenceEngine:
             
             elif len(parts) >= 3:
                 # Try "Track - Artist - Title" or "Artist - Album - Title"
-                if re.match(r'^\d{1,3}$', parts[0].strip()):
+                if _TRACK_NUMBER_RE.match(parts[0].strip()):
                     candidates.append({
                         'value': parts[-1].strip(),
                         'confidence': 80,
@@ -264,7 +291,7 @@ class MetadataInferenceEngine:
         filename_clean = evidence_state['filename_no_ext']
         
         # Remove leading track numbers
-        track_removed = re.sub(r'^\d{1,3}[\s\-_.]+', '', filename_clean)
+        track_removed = _TRACK_PREFIX_RE.sub('', filename_clean)
         if track_removed != filename_clean:
             candidates.append({
                 'value': track_removed.strip(),
@@ -337,7 +364,7 @@ class MetadataInferenceEngine:
             if len(parts) >= 2:
                 # First part might be artist (unless it's a track number)
                 first_part = parts[0].strip()
-                if not re.match(r'^\d{1,3}$', first_part):
+                if not _TRACK_NUMBER_RE.match(first_part):
                     candidates.append({
                         'value': first_part,
                         'confidence': 70,
@@ -346,7 +373,7 @@ class MetadataInferenceEngine:
                     })
                 
                 # For 3+ parts, second might be artist
-                if len(parts) >= 3 and re.match(r'^\d{1,3}$', parts[0].strip()):
+                if len(parts) >= 3 and _TRACK_NUMBER_RE.match(parts[0].strip()):
                     candidates.append({
                         'value': parts[1].strip(),
                         'confidence': 75,
@@ -427,7 +454,7 @@ class MetadataInferenceEngine:
                 })
         
         # Strategy 3: Common album patterns in parentheses
-        paren_matches = re.findall(r'\(([^)]+)\)', evidence_state['filename'])
+        paren_matches = _PARENS_RE.findall(evidence_state['filename'])
         for match in paren_matches:
             # Check if it's a year
             if not re.match(r'^\d{4}$', match):
@@ -469,7 +496,7 @@ class MetadataInferenceEngine:
         # Strategy 2: From sibling patterns
         if evidence_state['sibling_patterns'].get('track_pattern') == 'prefix_number':
             # Try to extract from current filename using same pattern
-            match = re.match(r'^(\d{1,3})[\s\-_.]+', filename)
+            match = _TRACK_PREFIX_RE.match(filename)
             if match:
                 candidates.append({
                     'value': match.group(1).lstrip('0') or '0',
@@ -640,7 +667,7 @@ class MetadataInferenceEngine:
                         })
         
         # Strategy 3: Extract from parentheses (often contains composer)
-        paren_matches = re.findall(r'\(([^)]+)\)', evidence_state['filename'])
+        paren_matches = _PARENS_RE.findall(evidence_state['filename'])
         for match in paren_matches:
             # Check if it looks like a name (capitalized words)
             if re.match(r'^[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*$', match.strip()):
@@ -706,22 +733,14 @@ class MetadataInferenceEngine:
     def _clean_title(self, title: str) -> str:
         """Clean up a title string"""
         # Remove common artifacts
-        title = re.sub(r'\.(mp3|flac|m4a|wav|wma|wv)$', '', title, flags=re.IGNORECASE)
-        title = re.sub(r'^[\d\s\-_.]+', '', title)  # Remove leading track numbers
-        title = re.sub(r'\s+', ' ', title)  # Normalize whitespace
+        title = _AUDIO_SUFFIX_RE.sub('', title)
+        title = _LEADING_TRACK_CHARS_RE.sub('', title)  # Remove leading track numbers
+        title = _WHITESPACE_RE.sub(' ', title)  # Normalize whitespace
         title = title.strip(' -_.')
         
         # Remove quality indicators
-        quality_patterns = [
-            r'\[?\d{3,4}kbps\]?',
-            r'\[?320\]?',
-            r'\[?FLAC\]?',
-            r'\[?MP3\]?',
-            r'\(Explicit\)',
-            r'\[Explicit\]',
-        ]
-        for pattern in quality_patterns:
-            title = re.sub(pattern, '', title, flags=re.IGNORECASE)
+        for pattern in _QUALITY_RES:
+            title = pattern.sub('', title)
         
         return title.strip()
     
@@ -883,7 +902,7 @@ class MetadataInferenceEngine:
             })
             
             with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
+                data = json_loads(response.read())
                 
                 with self.cache_lock:
                     self.cache[cache_key] = (data, time.time())
@@ -950,7 +969,7 @@ class MetadataInferenceEngine:
             })
             
             with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
+                data = json_loads(response.read())
                 
                 # Cache result
                 with self.cache_lock:
@@ -980,7 +999,7 @@ class MetadataInferenceEngine:
             })
             
             with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
+                data = json_loads(response.read())
                 
                 with self.cache_lock:
                     self.cache[cache_key] = (data, time.time())
@@ -1009,7 +1028,7 @@ class MetadataInferenceEngine:
             })
             
             with urllib.request.urlopen(req, timeout=10) as response:
-                data = json.loads(response.read().decode('utf-8'))
+                data = json_loads(response.read())
                 
                 with self.cache_lock:
                     self.cache[cache_key] = (data, time.time())
@@ -1172,8 +1191,8 @@ class MetadataInferenceEngine:
             
             candidate['confidence'] = round(confidence)
         
-        # Sort by confidence
-        return sorted(candidates, key=lambda x: x['confidence'], reverse=True)
+        # Ranking is left to the caller, which only needs the top few
+        return candidates
 
 # Create global inference engine instance
 inference_engine = MetadataInferenceEngine()
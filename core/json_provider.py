@@ -0,0 +1,78 @@
+# Metadata Remote - Intelligent audio metadata editor
+# Copyright (C) 2025 Dr. William Nelson Leonard
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+JSON provider for Metadata Remote
+Handles fast JSON encoding for Flask responses using orjson when available
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library encoder
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson, falling back to stdlib json"""
+    
+    def _orjson_option(self):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string"""
+        # Pretty-printing and other stdlib-specific options use the default encoder
+        if orjson is None or kwargs.get('indent') is not None:
+            return super().dumps(obj, **kwargs)
+        
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode('utf-8')
+        except TypeError:
+            # orjson is stricter (e.g. integers beyond 64 bits); let stdlib handle it
+            return super().dumps(obj, **kwargs)
+    
+    def dumpb(self, obj):
+        """Serialize obj to UTF-8 encoded JSON bytes"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_option())
+            except TypeError:
+                pass
+        return super().dumps(obj).encode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        """Build a JSON response (used by jsonify), encoding straight to bytes"""
+        # Pretty-printed output (debug mode or compact=False) uses the default path
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            data = orjson.dumps(obj, default=self.default, option=self._orjson_option())
+        except TypeError:
+            return super().response(*args, **kwargs)
+        
+        # orjson already produces UTF-8 bytes; skip the decode/re-encode round trip
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes"""
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
@@ -23,8 +23,14 @@ Licensed under LGPL-2.1+ for audio metadata operations.
 """
 
 import os
-import base64
+import copy
+import binascii
+import hashlib
+import struct
 import logging
+import functools
+import threading
+from collections import OrderedDict
 from typing import Dict, Any, Optional, Union, Tuple
 import unicodedata
 
@@ -37,10 +43,103 @@ from mutagen.flac import FLAC, Picture
 from mutagen.mp4 import MP4, MP4Cover
 from mutagen.asf import ASF
 from mutagen.wavpack import WavPack
+from mutagen.apev2 import APEv2File
 from mutagen.wave import WAVE
 from mutagen.id3 import PictureType
 
-from config import logger, FORMAT_METADATA_CONFIG
+from config import logger, FORMAT_METADATA_CONFIG, METADATA_CACHE_SIZE
+
+# Big-endian 32-bit fields of a FLAC picture block
+_U32 = struct.Struct('>I')
+_U32_PAIR = struct.Struct('>II')
+
+def _stat_cached(method=None, *, maxsize=METADATA_CACHE_SIZE, copy_result=True):
+    """
+    Cache a read method's result per filepath while its (st_mtime_ns, st_size) match
+    
+    A modified file no longer matches its entry, so stale results are never
+    returned for files whose mtime or size changed. Entries are evicted in LRU
+    order and can be dropped for one path with wrapper.cache_invalidate().
+    Unless copy_result is False, callers receive a deep copy and may mutate
+    the result freely.
+    """
+    if method is None:
+        return functools.partial(_stat_cached, maxsize=maxsize, copy_result=copy_result)
+    
+    cache = OrderedDict()
+    lock = threading.Lock()
+    
+    @functools.wraps(method)
+    def wrapper(self, filepath):
+        try:
+            st = os.stat(filepath)
+        except OSError:
+            return method(self, filepath)
+        
+        stamp = (st.st_mtime_ns, st.st_size)
+        with lock:
+            entry = cache.get(filepath)
+            if entry is not None and entry[0] == stamp:
+                cache.move_to_end(filepath)
+            else:
+                entry = None
+        
+        if entry is None:
+            entry = (stamp, method(self, filepath))
+            with lock:
+                cache[filepath] = entry
+                cache.move_to_end(filepath)
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+        
+        return copy.deepcopy(entry[1]) if copy_result else entry[1]
+    
+    def cache_invalidate(filepath):
+        with lock:
+            cache.pop(filepath, None)
+    
+    def cache_clear():
+        with lock:
+            cache.clear()
+    
+    wrapper.cache_invalidate = cache_invalidate
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def _invalidates_cache(method):
+    """Drop cached reads of a file after a method that modifies it on disk"""
+    @functools.wraps(method)
+    def wrapper(self, filepath, *args, **kwargs):
+        try:
+            return method(self, filepath, *args, **kwargs)
+        finally:
+            # Filesystems with coarse mtimes may not change the cache key on write
+            self.invalidate_read_cache(filepath)
+    return wrapper
+
+
+def _keep_padding(info):
+    """
+    Mutagen padding policy that never shrinks existing padding
+    
+    Edits that fit in the current padding are written in place, and trimming
+    surplus padding would otherwise force a full rewrite of the audio data.
+    When the tags outgrow the padding, Mutagen's default amount is reserved
+    so the next edit fits again.
+    """
+    if info.padding >= 0:
+        return info.padding
+    return info.get_default_padding()
+
+
+def _save(audio_file):
+    """Save a Mutagen file object, preferring in-place tag updates"""
+    # APEv2 files (WavPack) have no padding to manage
+    if isinstance(audio_file, APEv2File):
+        audio_file.save()
+    else:
+        audio_file.save(padding=_keep_padding)
 
 
 class FieldNameMapper:
@@ -444,8 +543,11 @@ class MutagenHandler:
         self.frame_to_field = {}
         # All variations to frame ID mapping
         self.field_variations = {}
+        # Lowercase variation -> (frame order, frame ID), for O(1) lookups;
+        # the order lets ambiguous inputs resolve to the first matching frame
+        self.variation_index = {}
         
-        for frame_id, info in self.id3_text_frames.items():
+        for order, (frame_id, info) in enumerate(self.id3_text_frames.items()):
             # Add primary name
             primary = info["primary_name"]
             self.field_to_frame[primary] = frame_id
@@ -462,6 +564,8 @@ class MutagenHandler:
                     variations_list.append(no_sep)
             
             self.field_variations[primary] = variations_list
+            for variation in variations_list:
+                self.variation_index.setdefault(variation, (order, frame_id))
     
     def normalize_field_name(self, user_input: str) -> Optional[str]:
         """Normalize user input to find matching ID3v2 frame"""
@@ -483,15 +587,11 @@ class MutagenHandler:
         if normalized in self.field_to_frame:
             return self.field_to_frame[normalized]
         
-        # Check all variations
-        for primary, variations in self.field_variations.items():
-            if normalized in variations:
-                return self.field_to_frame[primary]
-            
-            # Try without spaces/underscores
-            no_sep = normalized.replace(" ", "").replace("_", "")
-            if no_sep in variations:
-                return self.field_to_frame[primary]
+        # Check all variations, as-is and without spaces/underscores
+        no_sep = normalized.replace(" ", "").replace("_", "")
+        matches = [self.variation_index[key] for key in (normalized, no_sep) if key in self.variation_index]
+        if matches:
+            return min(matches)[1]
         
         # Try removing trailing 's' for plurals
         if normalized.endswith('s') and len(normalized) > 2:
@@ -500,9 +600,9 @@ class MutagenHandler:
                 return self.field_to_frame[singular]
             
             # Check variations again with singular form
-            for primary, variations in self.field_variations.items():
-                if singular in variations:
-                    return self.field_to_frame[primary]
+            match = self.variation_index.get(singular)
+            if match:
+                return match[1]
         
         # No match found - would create TXXX frame
         return None
@@ -554,6 +654,36 @@ class MutagenHandler:
             logger.error(f"Error detecting format for {filepath}: {e}")
             return None, 'unknown'
     
+    @_stat_cached(maxsize=32, copy_result=False)
+    def detect_format_for_read(self, filepath: str) -> Tuple[Optional[File], str]:
+        """
+        Like detect_format, but shares one parsed Mutagen object between read-only callers
+        
+        Loading a file's metadata reads standard fields, existing fields, all
+        fields and album art; this parses the file once for all of them.
+        The returned object must not be modified or saved.
+        
+        Returns:
+            Tuple of (Mutagen File object, format string)
+        """
+        return self.detect_format(filepath)
+    
+    def _read_caches(self):
+        return (self.detect_format_for_read, self.read_metadata,
+                self.read_existing_metadata, self.discover_all_metadata,
+                self.get_album_art_bytes)
+    
+    def invalidate_read_cache(self, filepath: str):
+        """Drop cached metadata reads for one file"""
+        for cached_read in self._read_caches():
+            cached_read.cache_invalidate(filepath)
+    
+    def clear_read_cache(self):
+        """Drop all cached metadata reads"""
+        for cached_read in self._read_caches():
+            cached_read.cache_clear()
+    
+    @_stat_cached
     def read_metadata(self, filepath: str) -> Dict[str, Any]:
         """
         Read metadata from audio file using Mutagen
@@ -561,7 +691,7 @@ class MutagenHandler:
         Returns:
             Dictionary with normalized metadata
         """
-        audio_file, format_type = self.detect_format(filepath)
+        audio_file, format_type = self.detect_format_for_read(filepath)
         if audio_file is None:
             raise Exception("Could not read file with Mutagen")
         
@@ -590,16 +720,11 @@ class MutagenHandler:
                     metadata[field] = value
         
         elif isinstance(audio_file, (OggVorbis, OggOpus, FLAC)):
-            # These use Vorbis comments
+            # These use Vorbis comments; keys are case-insensitive
+            comments = self._vorbis_comment_index(audio_file)
             for field, tag_name in tag_map.items():
-                if format_type == 'flac':
-                    # FLAC uses lowercase
-                    tag_name = tag_name.lower()
-                if tag_name in audio_file:
-                    value = audio_file[tag_name]
-                    # Vorbis comments can be lists
-                    if isinstance(value, list):
-                        value = value[0] if value else ''
+                value = comments.get(tag_name.lower())
+                if value is not None:
                     metadata[field] = str(value)
         
         elif isinstance(audio_file, MP4):
@@ -652,6 +777,7 @@ class MutagenHandler:
         
         return normalized_metadata
     
+    @_stat_cached
     def read_existing_metadata(self, filepath: str) -> Dict[str, Any]:
         """
         Read only existing metadata fields from audio file using Mutagen
@@ -659,7 +785,7 @@ class MutagenHandler:
         Returns:
             Dictionary with only existing metadata fields (no empty defaults)
         """
-        audio_file, format_type = self.detect_format(filepath)
+        audio_file, format_type = self.detect_format_for_read(filepath)
         if audio_file is None:
             raise Exception("Could not read file with Mutagen")
         
@@ -680,18 +806,12 @@ class MutagenHandler:
                         metadata[field] = value
         
         elif isinstance(audio_file, (OggVorbis, OggOpus, FLAC)):
-            # These use Vorbis comments
+            # These use Vorbis comments; keys are case-insensitive
+            comments = self._vorbis_comment_index(audio_file)
             for field, tag_name in tag_map.items():
-                if format_type == 'flac':
-                    # FLAC uses lowercase
-                    tag_name = tag_name.lower()
-                if tag_name in audio_file:
-                    value = audio_file[tag_name]
-                    # Vorbis comments can be lists
-                    if isinstance(value, list):
-                        value = value[0] if value else ''
-                    if value:  # Only include non-empty values
-                        metadata[field] = str(value)
+                value = comments.get(tag_name.lower())
+                if value:  # Only include non-empty values
+                    metadata[field] = str(value)
         
         elif isinstance(audio_file, MP4):
             # MP4 uses atoms
@@ -749,6 +869,19 @@ class MutagenHandler:
         
         return normalized_metadata
     
+    def _vorbis_comment_index(self, audio_file) -> Dict[str, str]:
+        """
+        Map each lowercased Vorbis comment key to its first value
+        
+        Mutagen's key lookups scan the whole comment list, so checking and
+        then reading every mapped field costs O(fields * comments). One pass
+        here makes each field lookup a dict hit.
+        """
+        index = {}
+        for key, value in audio_file.tags or ():
+            index.setdefault(key.lower(), value)
+        return index
+    
     def _is_vorbis_format(self, audio_file) -> bool:
         """Check if audio file uses Vorbis Comments"""
         from mutagen.flac import FLAC
@@ -760,8 +893,10 @@ class MutagenHandler:
         """Convert single space to empty string for UI display"""
         return '' if value == ' ' else value
     
+    @_invalidates_cache
     def write_metadata(self, filepath: str, metadata: Dict[str, str], 
-                      preserve_other_tags: bool = True) -> bool:
+                      preserve_other_tags: bool = True, art_data=None,
+                      picture_cache: Optional[dict] = None) -> bool:
         """
         Write metadata to audio file using Mutagen
         
@@ -769,6 +904,8 @@ class MutagenHandler:
             filepath: Path to audio file
             metadata: Dictionary of metadata to write
             preserve_other_tags: Whether to preserve existing tags not in metadata dict
+            art_data: Album art (raw bytes or base64) to embed in the same save (optional)
+            picture_cache: Per-batch memo of built picture payloads (optional)
             
         Returns:
             bool: True if successful, False otherwise
@@ -1173,8 +1310,12 @@ class MutagenHandler:
                     logger.warning(f"Failed to set audiobook properties: {e}")
                     # Continue with save anyway
             
+            # Replace album art in the same save, so the file is rewritten once
+            if art_data:
+                self._set_album_art(audio_file, filepath, art_data, picture_cache=picture_cache)
+            
             # Save the file
-            audio_file.save()
+            _save(audio_file)
             return True
         except Exception as e:
             logger.error(f"Error writing metadata to {filepath}: {e}")
@@ -1187,29 +1328,47 @@ class MutagenHandler:
         Returns:
             Base64-encoded image data or None
         """
-        audio_file, format_type = self.detect_format(filepath)
+        image_data = self.get_album_art_bytes(filepath)
+        if image_data is None:
+            return None
+        return binascii.b2a_base64(image_data, newline=False).decode('ascii')
+    
+    # Bytes are immutable, so callers can share the cached image. For MP3/FLAC
+    # it is the same object the cached parse holds; Ogg/Opus skips re-decoding
+    # the picture block on repeat views.
+    @_stat_cached(maxsize=32, copy_result=False)
+    def get_album_art_bytes(self, filepath: str) -> Optional[bytes]:
+        """
+        Extract album art from audio file without base64 encoding it
+        
+        Returns:
+            Raw image bytes or None
+        """
+        audio_file, format_type = self.detect_format_for_read(filepath)
         if audio_file is None:
             return None
         
         try:
             if isinstance(audio_file, MP3):
-                # Look for APIC frames
-                for key in audio_file.tags.keys():
-                    if key.startswith('APIC'):
-                        apic = audio_file.tags[key]
-                        return base64.b64encode(apic.data).decode('utf-8')
+                # Look for APIC frames; a file without an ID3 tag has no art
+                if audio_file.tags:
+                    apics = audio_file.tags.getall('APIC')
+                    if apics:
+                        return apics[0].data
             
             elif isinstance(audio_file, (OggVorbis, OggOpus)):
-                # Check for METADATA_BLOCK_PICTURE
-                if 'METADATA_BLOCK_PICTURE' in audio_file:
+                # Check for METADATA_BLOCK_PICTURE; each Vorbis comment lookup walks
+                # every comment, so fetch the values in the same pass as the check
+                pictures = audio_file.get('METADATA_BLOCK_PICTURE')
+                if pictures:
                     # It's already base64 encoded in the file
-                    picture_data = audio_file['METADATA_BLOCK_PICTURE'][0]
+                    picture_data = pictures[0]
                     # Decode the base64 METADATA_BLOCK_PICTURE
                     try:
-                        picture_block = base64.b64decode(picture_data)
+                        picture_block = binascii.a2b_base64(picture_data)
                         # Parse the picture block to get the actual image data
                         pic_type, mime_type, image_data = self._parse_flac_picture_block(picture_block)
-                        return base64.b64encode(image_data).decode('utf-8')
+                        return image_data
                     except:
                         logger.warning("Failed to parse METADATA_BLOCK_PICTURE")
                         return None
@@ -1217,14 +1376,14 @@ class MutagenHandler:
             elif isinstance(audio_file, FLAC):
                 # FLAC stores pictures differently
                 if audio_file.pictures:
-                    return base64.b64encode(audio_file.pictures[0].data).decode('utf-8')
+                    return audio_file.pictures[0].data
             
             elif isinstance(audio_file, MP4):
                 # MP4 cover art
                 if 'covr' in audio_file:
                     covers = audio_file['covr']
                     if covers:
-                        return base64.b64encode(bytes(covers[0])).decode('utf-8')
+                        return bytes(covers[0])
             
             elif isinstance(audio_file, ASF):
                 # WMA album art
@@ -1241,7 +1400,7 @@ class MutagenHandler:
                             desc_len = int.from_bytes(data[offset:offset+4], 'little')
                             offset += 4 + desc_len
                             image_data = data[offset:]
-                            return base64.b64encode(image_data).decode('utf-8')
+                            return image_data
             
             elif isinstance(audio_file, (WAVE, WavPack)):
                 # WAV and WavPack don't support embedded album art
@@ -1252,35 +1411,92 @@ class MutagenHandler:
         
         return None
     
-    def write_album_art(self, filepath: str, art_data: str, mime_type: str = None) -> None:
+    def has_album_art(self, filepath: str) -> bool:
+        """
+        Check whether a file carries embedded album art without extracting it
+        
+        Only looks for the picture frame/atom/block, so nothing is decoded.
+        
+        Returns:
+            bool: True if the file has an embedded picture
+        """
+        base_format = os.path.splitext(filepath)[1].lstrip('.').lower()
+        if base_format in FORMAT_METADATA_CONFIG.get('no_embedded_art', []):
+            return False
+        
+        audio_file, format_type = self.detect_format_for_read(filepath)
+        if audio_file is None:
+            return False
+        
+        try:
+            if isinstance(audio_file, MP3):
+                return bool(audio_file.tags) and bool(audio_file.tags.getall('APIC'))
+            elif isinstance(audio_file, (OggVorbis, OggOpus)):
+                return bool(audio_file.get('METADATA_BLOCK_PICTURE'))
+            elif isinstance(audio_file, FLAC):
+                return bool(audio_file.pictures)
+            elif isinstance(audio_file, MP4):
+                return bool(audio_file.get('covr'))
+            elif isinstance(audio_file, ASF):
+                return any('WM/Picture' in key for key in audio_file.keys())
+        except Exception as e:
+            logger.error(f"Error checking album art: {e}")
+        
+        return False
+
+    @_invalidates_cache
+    def write_album_art(self, filepath: str, art_data: str, mime_type: str = None,
+                        picture_cache: Optional[dict] = None) -> None:
         """
         Write album art to audio file
         
         Args:
             filepath: Path to audio file
-            art_data: Base64-encoded image data (may include data URI prefix)
+            art_data: Raw image bytes, or base64-encoded image data (may include data URI prefix)
             mime_type: MIME type of the image (will be detected if not provided)
+            picture_cache: Per-batch memo of built picture payloads (optional)
         """
         audio_file, format_type = self.detect_format(filepath)
         if audio_file is None:
             raise Exception("Could not open file with Mutagen")
         
+        if self._set_album_art(audio_file, filepath, art_data, mime_type, picture_cache):
+            # Save the file
+            _save(audio_file)
+    
+    def _set_album_art(self, audio_file, filepath: str, art_data, mime_type: str = None,
+                       picture_cache: Optional[dict] = None) -> bool:
+        """
+        Replace the album art on an open Mutagen file object without saving it
+        
+        Args:
+            audio_file: Mutagen file object (from detect_format)
+            filepath: Path to audio file
+            art_data: Raw image bytes, or base64-encoded image data (may include data URI prefix)
+            mime_type: MIME type of the image (will be detected if not provided)
+            picture_cache: Per-batch memo of built picture payloads (optional)
+            
+        Returns:
+            bool: True if the art was set, False if the format cannot embed art
+        """
         # Check if format supports album art
         base_format = os.path.splitext(filepath)[1].lstrip('.')
         if base_format in FORMAT_METADATA_CONFIG.get('no_embedded_art', []):
             logger.warning(f"Format {base_format} does not support embedded album art")
-            return
+            return False
         
         # Decode the image data
-        if ',' in art_data:
+        if isinstance(art_data, bytes):
+            image_data = art_data
+        elif ',' in art_data:
             # Remove data URI prefix
-            image_data = base64.b64decode(art_data.split(',')[1])
+            image_data = binascii.a2b_base64(art_data.split(',')[1])
         else:
-            image_data = base64.b64decode(art_data)
+            image_data = binascii.a2b_base64(art_data)
         
         # Detect MIME type if not provided
         if not mime_type:
-            mime_type = self._detect_mime_type(image_data)
+            mime_type = self.detect_mime_type(image_data)
         
         if isinstance(audio_file, MP3):
             # Remove existing APIC frames
@@ -1297,12 +1513,10 @@ class MutagenHandler:
             )
         
         elif isinstance(audio_file, (OggVorbis, OggOpus)):
-            # Create METADATA_BLOCK_PICTURE
-            picture_block = self._create_flac_picture_block(
-                image_data, mime_type, pic_type=3, description=""
-            )
-            # Encode to base64 and set
-            audio_file['METADATA_BLOCK_PICTURE'] = [base64.b64encode(picture_block).decode('ascii')]
+            # Create METADATA_BLOCK_PICTURE, encoded to base64
+            audio_file['METADATA_BLOCK_PICTURE'] = [self._picture_value(
+                self._vorbis_picture_value, image_data, mime_type, picture_cache
+            )]
         
         elif isinstance(audio_file, FLAC):
             # Clear existing pictures
@@ -1327,21 +1541,6 @@ class MutagenHandler:
             audio_file['covr'] = [MP4Cover(image_data, imageformat=cover_format)]
         
         elif isinstance(audio_file, ASF):
-            # Build WM/Picture structure
-            import struct
-            picture_data = bytearray()
-            picture_data.append(3)  # Picture type (front cover)
-            
-            mime_bytes = mime_type.encode('utf-16-le')
-            picture_data.extend(struct.pack('<I', len(mime_bytes)))
-            picture_data.extend(mime_bytes)
-            
-            desc_bytes = 'Cover'.encode('utf-16-le')
-            picture_data.extend(struct.pack('<I', len(desc_bytes)))
-            picture_data.extend(desc_bytes)
-            
-            picture_data.extend(image_data)
-            
             # Remove existing pictures
             keys_to_remove = [k for k in audio_file.keys() if 'WM/Picture' in k]
             for key in keys_to_remove:
@@ -1349,16 +1548,18 @@ class MutagenHandler:
             
             # Add new picture
             from mutagen.asf import ASFByteArrayAttribute
-            audio_file['WM/Picture'] = ASFByteArrayAttribute(bytes(picture_data))
+            audio_file['WM/Picture'] = ASFByteArrayAttribute(self._picture_value(
+                self._asf_picture_value, image_data, mime_type, picture_cache
+            ))
         
         elif isinstance(audio_file, (WAVE, WavPack)):
             # WAV and WavPack don't support embedded album art
             logger.warning(f"{type(audio_file).__name__} format does not support embedded album art")
-            return
+            return False
         
-        # Save the file
-        audio_file.save()
+        return True
     
+    @_invalidates_cache
     def remove_album_art(self, filepath: str) -> None:
         """Remove all album art from audio file"""
         audio_file, format_type = self.detect_format(filepath)
@@ -1394,90 +1595,112 @@ class MutagenHandler:
             pass
         
         # Save the file
-        audio_file.save()
+        _save(audio_file)
     
-    def _detect_mime_type(self, image_data: bytes) -> str:
+    def detect_mime_type(self, image_data: bytes) -> str:
         """Detect MIME type from image data"""
-        if image_data[:2] == b'\xff\xd8':
+        # startswith compares in place instead of slicing a copy of the header
+        if image_data.startswith(b'\xff\xd8'):
             return 'image/jpeg'
-        elif image_data[:8] == b'\x89PNG\r\n\x1a\n':
+        elif image_data.startswith(b'\x89PNG\r\n\x1a\n'):
             return 'image/png'
-        elif image_data[:4] == b'GIF8':
+        elif image_data.startswith(b'GIF8'):
             return 'image/gif'
-        elif image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        elif image_data.startswith(b'RIFF') and image_data.startswith(b'WEBP', 8):
             return 'image/webp'
         else:
             return 'image/jpeg'  # Default
     
+    def _picture_value(self, build, image_data: bytes, mime_type: str,
+                       picture_cache: Optional[dict] = None):
+        """
+        Build a picture payload, reusing one already built for the same image in this batch
+        
+        Args:
+            build: Payload builder (_vorbis_picture_value or _asf_picture_value)
+            image_data: Raw image bytes
+            mime_type: MIME type of the image
+            picture_cache: Per-batch memo keyed on an image digest; None builds directly
+            
+        Returns:
+            The payload returned by build
+        """
+        if picture_cache is None:
+            return build(image_data, mime_type)
+        
+        key = (build.__name__, mime_type, hashlib.blake2b(image_data, digest_size=16).digest())
+        value = picture_cache.get(key)
+        if value is None:
+            # Batch workers may race here; at worst a payload is built twice
+            value = picture_cache[key] = build(image_data, mime_type)
+        return value
+    
+    def _vorbis_picture_value(self, image_data: bytes, mime_type: str) -> str:
+        """Base64 METADATA_BLOCK_PICTURE value for OGG Vorbis/Opus"""
+        picture_block = self._create_flac_picture_block(
+            image_data, mime_type, pic_type=3, description=""
+        )
+        return binascii.b2a_base64(picture_block, newline=False).decode('ascii')
+    
+    def _asf_picture_value(self, image_data: bytes, mime_type: str) -> bytes:
+        """WM/Picture structure for WMA: Type(1) + Mime Length(4) + Mime + Desc Length(4) + Desc + Data"""
+        mime_bytes = mime_type.encode('utf-16-le')
+        desc_bytes = 'Cover'.encode('utf-16-le')
+        return b''.join((
+            b'\x03',                                            # Picture type (front cover)
+            struct.pack('<I', len(mime_bytes)), mime_bytes,
+            struct.pack('<I', len(desc_bytes)), desc_bytes,
+            image_data,
+        ))
+    
     def _create_flac_picture_block(self, image_data: bytes, mime_type: str,
                                   pic_type: int = 3, description: str = "") -> bytes:
         """
         Create FLAC METADATA_BLOCK_PICTURE structure
         Used for OGG Vorbis/Opus and FLAC
         """
-        import struct
-        
         # Encode strings
         mime_bytes = mime_type.encode('utf-8')
         desc_bytes = description.encode('utf-8')
         
-        # Build the picture block
-        data = bytearray()
-        
-        # Picture type (32-bit big-endian)
-        data.extend(struct.pack('>I', pic_type))
-        
-        # MIME type length and string
-        data.extend(struct.pack('>I', len(mime_bytes)))
-        data.extend(mime_bytes)
-        
-        # Description length and string
-        data.extend(struct.pack('>I', len(desc_bytes)))
-        data.extend(desc_bytes)
-        
-        # Width, Height, Color depth, Colors used (all 0)
-        data.extend(struct.pack('>IIII', 0, 0, 0, 0))
-        
-        # Picture data length and data
-        data.extend(struct.pack('>I', len(image_data)))
-        data.extend(image_data)
-        
-        return bytes(data)
+        # Join the fields in one allocation, so the image is copied only once
+        return b''.join((
+            _U32.pack(pic_type),                                # Picture type
+            _U32.pack(len(mime_bytes)), mime_bytes,             # MIME type
+            _U32.pack(len(desc_bytes)), desc_bytes,             # Description
+            bytes(16),                                          # Width, height, depth, colors (all 0)
+            _U32.pack(len(image_data)), image_data,             # Picture data
+        ))
     
     def _parse_flac_picture_block(self, data: bytes) -> Tuple[int, str, bytes]:
         """Parse FLAC METADATA_BLOCK_PICTURE structure"""
-        import struct
-        
-        if len(data) < 32:
+        size = len(data)
+        if size < 32:
             raise ValueError("Invalid picture block: too short")
         
-        offset = 0
-        
-        # Picture type
-        pic_type = struct.unpack('>I', data[offset:offset+4])[0]
-        offset += 4
+        # Picture type and MIME type length
+        pic_type, mime_len = _U32_PAIR.unpack_from(data, 0)
+        mime_end = 8 + mime_len
+        # The description length field must follow the MIME type
+        if mime_end + 4 > size:
+            raise ValueError("Invalid picture block: MIME type overruns block")
+        mime_type = data[8:mime_end].decode('utf-8', errors='replace')
         
-        # MIME type length and string
-        mime_len = struct.unpack('>I', data[offset:offset+4])[0]
-        offset += 4
-        mime_type = data[offset:offset+mime_len].decode('utf-8', errors='replace')
-        offset += mime_len
-        
-        # Description length and string
-        desc_len = struct.unpack('>I', data[offset:offset+4])[0]
-        offset += 4
-        offset += desc_len  # Skip description
-        
-        # Skip dimensions (4 x 4 bytes)
-        offset += 16
+        # Skip the description and the dimensions (4 x 4 bytes) to the data length
+        desc_len = _U32.unpack_from(data, mime_end)[0]
+        pic_offset = mime_end + 4 + desc_len + 16 + 4
+        if pic_offset > size:
+            raise ValueError("Invalid picture block: description overruns block")
         
         # Picture data length and data
-        pic_len = struct.unpack('>I', data[offset:offset+4])[0]
-        offset += 4
-        pic_data = data[offset:offset+pic_len]
+        pic_len = _U32.unpack_from(data, pic_offset - 4)[0]
+        if pic_offset + pic_len > size:
+            raise ValueError("Invalid picture block: picture data truncated")
+        pic_data = data[pic_offset:pic_offset + pic_len]
         
         return pic_type, mime_type, pic_data
     
+    @_stat_cached
     def discover_all_metadata(self, filepath: str) -> Dict[str, Dict[str, Any]]:
         """
         Discover ALL metadata fields from an audio file.
@@ -1490,7 +1713,7 @@ class MutagenHandler:
         - field_type: 'text', 'binary', 'oversized'
         """
         try:
-            audio_file, format_type = self.detect_format(filepath)
+            audio_file, format_type = self.detect_format_for_read(filepath)
             if audio_file is None:
                 logger.error(f"Could not read file: {filepath}")
                 return {}
@@ -1848,6 +2071,7 @@ class MutagenHandler:
         
         return mp4_display_names.get(atom, atom)
     
+    @_invalidates_cache
     def write_custom_field(self, filepath: str, field_name: str, field_value: str) -> bool:
         """
         Write a custom field to an audio file using appropriate format-specific method.
@@ -1931,7 +2155,7 @@ class MutagenHandler:
                     if txxx_key in audio_file.tags:
                         del audio_file.tags[txxx_key]
                 
-                audio_file.save()
+                _save(audio_file)
                 return True
             else:
                 logger.error(f"Unsupported format for custom fields: {type(audio_file)}")
@@ -1966,7 +2190,7 @@ class MutagenHandler:
                 if txxx_key in tags:
                     del tags[txxx_key]
             
-            tags.save(filepath)
+            tags.save(filepath, padding=_keep_padding)
             return True
             
         except Exception as e:
@@ -1987,7 +2211,7 @@ class MutagenHandler:
                 if field_key in audio_file:
                     del audio_file[field_key]
             
-            audio_file.save()
+            _save(audio_file)
             return True
             
         except Exception as e:
@@ -2009,7 +2233,7 @@ class MutagenHandler:
                 if key in audio_file:
                     del audio_file[key]
             
-            audio_file.save()
+            _save(audio_file)
             return True
             
         except Exception as e:
@@ -2029,7 +2253,7 @@ class MutagenHandler:
                 if field_key in audio_file:
                     del audio_file[field_key]
             
-            audio_file.save()
+            _save(audio_file)
             return True
             
         except Exception as e:
@@ -2047,13 +2271,14 @@ class MutagenHandler:
                 if field_name in audio_file:
                     del audio_file[field_name]
             
-            audio_file.save()
+            _save(audio_file)
             return True
             
         except Exception as e:
             logger.error(f"Error writing custom APEv2 field: {e}")
             return False
     
+    @_invalidates_cache
     def delete_field(self, filepath: str, field_id: str) -> bool:
         """
         Delete a metadata field from an audio file with format-aware field name handling
@@ -2177,7 +2402,7 @@ class MutagenHandler:
                             break
             
             # Save the file regardless (even if no field was deleted, this is a no-op)
-            audio_file.save()
+            _save(audio_file)
             return True
             
         except Exception as e:
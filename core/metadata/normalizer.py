@@ -18,96 +18,84 @@
 Metadata tag normalization for Metadata Remote
 Handles format-specific tag naming and normalization
 """
+from types import MappingProxyType
+
 from config import FORMAT_METADATA_CONFIG
 
+# Field name mappings, built once and shared read-only between callers
+_FIELD_MAPPING_LOWER = MappingProxyType({
+    'title': 'title',
+    'artist': 'artist',
+    'album': 'album',
+    'albumartist': 'albumartist',
+    'date': 'date',
+    'year': 'date',
+    'genre': 'genre',
+    'track': 'track',
+    'disc': 'disc',
+    'composer': 'composer'
+})
+_FIELD_MAPPING_UPPER = MappingProxyType({k: v.upper() for k, v in _FIELD_MAPPING_LOWER.items()})
+
+# Tag keys to try for each normalized field, in order of precedence
+_ITUNES_TAG_KEYS = (
+    ('title', ('title', 'TITLE', '©nam')),
+    ('artist', ('artist', 'ARTIST', '©ART')),
+    ('album', ('album', 'ALBUM', '©alb')),
+    ('albumartist', ('albumartist', 'ALBUMARTIST', 'album_artist', 'ALBUM_ARTIST', 'aART')),
+    ('date', ('date', 'DATE', '©day', 'year', 'YEAR')),
+    ('genre', ('genre', 'GENRE', '©gen')),
+    ('track', ('track', 'TRACK', 'trkn')),
+    ('disc', ('disc', 'DISC', 'disk', 'discnumber', 'DISCNUMBER')),
+    ('composer', ('composer', '©wrt')),
+)
+_VORBIS_TAG_KEYS = (
+    ('title', ('TITLE', 'title')),
+    ('artist', ('ARTIST', 'artist')),
+    ('album', ('ALBUM', 'album')),
+    ('albumartist', ('ALBUMARTIST', 'albumartist', 'album_artist')),
+    ('date', ('DATE', 'date', 'YEAR', 'year')),
+    ('genre', ('GENRE', 'genre')),
+    ('track', ('TRACKNUMBER', 'tracknumber', 'TRACK', 'track')),
+    ('disc', ('DISCNUMBER', 'discnumber', 'DISC', 'disc')),
+    ('composer', ('COMPOSER', 'composer')),
+)
+_STANDARD_TAG_KEYS = (
+    ('title', ('title', 'TITLE', 'Title')),
+    ('artist', ('artist', 'ARTIST', 'Artist')),
+    ('album', ('album', 'ALBUM', 'Album')),
+    ('albumartist', ('albumartist', 'ALBUMARTIST', 'album_artist', 'ALBUM_ARTIST', 'AlbumArtist')),
+    ('date', ('year', 'YEAR', 'Year', 'date', 'DATE', 'Date')),
+    ('genre', ('genre', 'GENRE', 'Genre')),
+    ('track', ('track', 'TRACK', 'Track', 'tracknumber', 'TRACKNUMBER')),
+    ('disc', ('disc', 'DISC', 'Disc', 'discnumber', 'DISCNUMBER', 'disk', 'DISK')),
+    ('composer', ('composer', 'COMPOSER', 'Composer', 'WM/Composer', 'TCOM')),
+)
+
 def normalize_metadata_tags(tags, format_type=''):
     """Normalize common tag names from various formats"""
     # Handle iTunes/MP4 specific tags
     if format_type in FORMAT_METADATA_CONFIG.get('itunes', []):
-        return {
-            'title': tags.get('title', tags.get('TITLE', tags.get('©nam', ''))),
-            'artist': tags.get('artist', tags.get('ARTIST', tags.get('©ART', ''))),
-            'album': tags.get('album', tags.get('ALBUM', tags.get('©alb', ''))),
-            'albumartist': tags.get('albumartist', tags.get('ALBUMARTIST', 
-                           tags.get('album_artist', tags.get('ALBUM_ARTIST', 
-                           tags.get('aART', ''))))),
-            'date': tags.get('date', tags.get('DATE', tags.get('©day', 
-                    tags.get('year', tags.get('YEAR', ''))))),
-            'genre': tags.get('genre', tags.get('GENRE', tags.get('©gen', ''))),
-            'track': tags.get('track', tags.get('TRACK', tags.get('trkn', ''))),
-            'disc': tags.get('disc', tags.get('DISC', tags.get('disk', 
-                    tags.get('discnumber', tags.get('DISCNUMBER', ''))))),
-            'composer': tags.get('composer', tags.get('©wrt', ''))
-        }
-    
+        candidates = _ITUNES_TAG_KEYS
     # Handle OGG/Opus specific normalization
     elif format_type in ['ogg', 'opus']:
-        # OGG uses specific field names
-        return {
-            'title': tags.get('TITLE', tags.get('title', '')),
-            'artist': tags.get('ARTIST', tags.get('artist', '')),
-            'album': tags.get('ALBUM', tags.get('album', '')),
-            'albumartist': tags.get('ALBUMARTIST', tags.get('albumartist', tags.get('album_artist', ''))),
-            'date': tags.get('DATE', tags.get('date', tags.get('YEAR', tags.get('year', '')))),
-            'genre': tags.get('GENRE', tags.get('genre', '')),
-            'track': tags.get('TRACKNUMBER', tags.get('tracknumber', tags.get('TRACK', tags.get('track', '')))),
-            'disc': tags.get('DISCNUMBER', tags.get('discnumber', tags.get('DISC', tags.get('disc', '')))),
-            'composer': tags.get('COMPOSER', tags.get('composer', ''))
-        }
-    
+        candidates = _VORBIS_TAG_KEYS
     # Standard normalization for other formats
+    else:
+        candidates = _STANDARD_TAG_KEYS
+    
+    # The first candidate key present wins; no fallbacks are evaluated after a hit
     return {
-        'title': tags.get('title', tags.get('TITLE', tags.get('Title', ''))),
-        'artist': tags.get('artist', tags.get('ARTIST', tags.get('Artist', ''))),
-        'album': tags.get('album', tags.get('ALBUM', tags.get('Album', ''))),
-        'albumartist': tags.get('albumartist', tags.get('ALBUMARTIST', 
-                       tags.get('album_artist', tags.get('ALBUM_ARTIST', 
-                       tags.get('AlbumArtist', ''))))),
-        'date': tags.get('year', tags.get('YEAR', tags.get('Year',
-                tags.get('date', tags.get('DATE', tags.get('Date', '')))))),
-        'genre': tags.get('genre', tags.get('GENRE', tags.get('Genre', ''))),
-        'track': tags.get('track', tags.get('TRACK', tags.get('Track', 
-                 tags.get('tracknumber', tags.get('TRACKNUMBER', ''))))),
-        'disc': tags.get('disc', tags.get('DISC', tags.get('Disc',
-                tags.get('discnumber', tags.get('DISCNUMBER', 
-                tags.get('disk', tags.get('DISK', ''))))))),
-        'composer': tags.get('composer', tags.get('COMPOSER', tags.get('Composer',
-            tags.get('WM/Composer', tags.get('TCOM', '')))))
+        field: next((tags[key] for key in keys if key in tags), '')
+        for field, keys in candidates
     }
 
 def get_metadata_field_mapping(use_uppercase, format_type=''):
     """Get proper metadata field names based on format"""
-    # Special handling for iTunes/MP4 formats
-    if format_type in FORMAT_METADATA_CONFIG.get('itunes', []):
-        return {
-            'title': 'title',
-            'artist': 'artist',
-            'album': 'album',
-            'albumartist': 'albumartist',
-            'date': 'date',
-            'year': 'date',
-            'genre': 'genre',
-            'track': 'track',
-            'disc': 'disc',
-            'composer': 'composer'
-        }
-    
-    base_mapping = {
-        'title': 'title',
-        'artist': 'artist',
-        'album': 'album',
-        'albumartist': 'albumartist',
-        'date': 'date',
-        'year': 'date',
-        'genre': 'genre',
-        'track': 'track',
-        'disc': 'disc',
-        'composer': 'composer'
-    }
-    
-    if use_uppercase:
-        return {k: v.upper() for k, v in base_mapping.items()}
-    return base_mapping
+    # iTunes/MP4 formats always use the lowercase names
+    if use_uppercase and format_type not in FORMAT_METADATA_CONFIG.get('itunes', []):
+        return _FIELD_MAPPING_UPPER
+    return _FIELD_MAPPING_LOWER
     
 def parse_multi_value_field(value, format_type=''):
     """
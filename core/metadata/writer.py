@@ -22,25 +22,33 @@ import os
 import logging
 
 from config import FORMAT_METADATA_CONFIG, logger
-from core.file_utils import get_file_format, fix_file_ownership
+from core.file_utils import get_file_format, queue_file_ownership_fix
 from core.metadata.mutagen_handler import mutagen_handler
+from core.album_art.processor import detect_corrupted_album_art, fix_corrupted_album_art
 
+# Request keys that carry album art rather than tag values
+_ART_FIELDS = frozenset(('art', 'removeArt'))
 
-def apply_metadata_to_file(filepath, new_tags, art_data=None, remove_art=False):
+def apply_metadata_to_file(filepath, new_tags, art_data=None, remove_art=False, art_path=None,
+                           picture_cache=None):
     """
     Apply metadata changes to a single file using Mutagen
     
     Args:
         filepath: Path to the audio file
         new_tags: Dictionary of metadata fields to update
-        art_data: Base64 encoded album art data (optional)
+        art_data: Base64 encoded album art data or raw image bytes (optional)
         remove_art: Whether to remove existing album art (optional)
+        art_path: Path to a raw image file to embed instead of art_data (optional)
+        picture_cache: Dict shared across a folder batch so each picture payload is built once (optional)
         
     Raises:
         Exception: For any errors during metadata writing
     """
-    # Import from the processor module
-    from core.album_art.processor import detect_corrupted_album_art, fix_corrupted_album_art
+    # Read raw image bytes directly, avoiding a base64 encode/decode round trip
+    if art_path:
+        with open(art_path, 'rb') as f:
+            art_data = f.read()
     
     # Get file format
     _, _, base_format = get_file_format(filepath)
@@ -57,36 +65,29 @@ def apply_metadata_to_file(filepath, new_tags, art_data=None, remove_art=False):
         art_data = None
     
     try:
-        # First, handle album art operations if needed
-        if remove_art:
-            mutagen_handler.remove_album_art(filepath)
-        elif art_data:
-            mutagen_handler.write_album_art(filepath, art_data)
-        else:
-            # For OGG/Opus files, we need to preserve existing album art
-            # when only updating text metadata
-            if base_format in ['ogg', 'opus']:
-                existing_art = mutagen_handler.get_album_art(filepath)
-                if existing_art:
-                    # We'll re-write it after updating metadata
-                    art_data = existing_art
-        
         # Prepare metadata for writing (exclude art-related fields)
-        metadata_to_write = {}
-        for field, value in new_tags.items():
-            if field not in ['art', 'removeArt']:
-                metadata_to_write[field] = value
+        metadata_to_write = {field: value for field, value in new_tags.items()
+                             if field not in _ART_FIELDS}
         
-        # Write metadata
-        if metadata_to_write:
-            mutagen_handler.write_metadata(filepath, metadata_to_write)
-        
-        # For OGG/Opus, re-write preserved album art if needed
-        if base_format in ['ogg', 'opus'] and art_data and not remove_art and 'art' not in new_tags:
-            mutagen_handler.write_album_art(filepath, art_data)
+        if art_data and not remove_art and metadata_to_write:
+            # New art and tags together: one open and one save for both
+            if not mutagen_handler.write_metadata(filepath, metadata_to_write, art_data=art_data,
+                                                 picture_cache=picture_cache):
+                raise Exception("Could not write metadata and album art")
+        else:
+            # First, handle album art operations if needed
+            if remove_art:
+                mutagen_handler.remove_album_art(filepath)
+            elif art_data:
+                mutagen_handler.write_album_art(filepath, art_data, picture_cache=picture_cache)
+            
+            # Write metadata in place; Mutagen only touches the changed comment keys,
+            # so an OGG/Opus METADATA_BLOCK_PICTURE survives without being re-written
+            if metadata_to_write:
+                mutagen_handler.write_metadata(filepath, metadata_to_write)
         
         # Fix file ownership
-        fix_file_ownership(filepath)
+        queue_file_ownership_fix(filepath)
         
         logger.info(f"Successfully updated {os.path.basename(filepath)}")
     
@@ -65,6 +65,12 @@ def worker_int(worker):
     """Called just after a worker exited on SIGINT or SIGQUIT."""
     worker.log.info("Worker received INT or QUIT signal")
 
+def worker_exit(server, worker):
+    """Called just after a worker has been exited, in the worker process."""
+    # Apply ownership fixes still queued on the worker's background thread
+    from core.file_utils import drain_ownership_queue
+    drain_ownership_queue()
+
 def pre_fork(server, worker):
     """Called just before a worker is forked."""
     server.log.info("Worker spawning (pid: %s)", worker.pid)
@@ -46,13 +46,69 @@ window.MetadataRemote.API = {
         }
     },
     
+    /**
+     * Make a streaming batch API call that reports per-file progress
+     * @param {string} url - The API endpoint
+     * @param {Object} options - Fetch options
+     * @param {Function} onProgress - Optional callback(done, total, line) per processed file
+     * @returns {Promise} Final result data
+     */
+    async callStream(url, options = {}, onProgress = null) {
+        try {
+            const response = await fetch(`${url}${url.includes('?') ? '&' : '?'}stream=1`, options);
+            if (!response.ok) {
+                const data = await response.json();
+                throw new Error(data.message || data.error || 'Request failed');
+            }
+            
+            // Body is NDJSON: a total line, one line per file, then the result
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let total = 0;
+            let done = 0;
+            let result = null;
+            
+            const handleLine = (line) => {
+                if (!line.trim()) return;
+                const data = JSON.parse(line);
+                if (data.file !== undefined) {
+                    done++;
+                    if (onProgress) onProgress(done, total, data);
+                } else if (data.total !== undefined) {
+                    total = data.total;
+                } else {
+                    result = data;
+                }
+            };
+            
+            while (true) {
+                const { value, done: finished } = await reader.read();
+                if (finished) break;
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.forEach(handleLine);
+            }
+            handleLine(buffer + decoder.decode());
+            
+            if (!result || result.status === 'error') {
+                throw new Error((result && result.error) || 'Request failed');
+            }
+            return result;
+        } catch (error) {
+            console.error(`API error for ${url}:`, error);
+            throw error;
+        }
+    },
+    
     // Tree and folder operations
-    async loadTree() {
-        return this.call('/tree/');
+    async loadTree(withSizes = false) {
+        return this.call(withSizes ? '/tree/?withAudio=1' : '/tree/');
     },
     
-    async loadTreeChildren(path) {
-        return this.call(`/tree/${encodeURIComponent(path)}`);
+    async loadTreeChildren(path, withSizes = false) {
+        return this.call(`/tree/${encodeURIComponent(path)}${withSizes ? '?withAudio=1' : ''}`);
     },
     
     async loadFiles(folderPath) {
@@ -87,8 +143,50 @@ window.MetadataRemote.API = {
         return this.call(`/metadata/${encodeURIComponent(filepath)}`);
     },
     
+    getAlbumArtUrl(filepath, version) {
+        return `/albumart/${encodeURIComponent(filepath)}?v=${encodeURIComponent(version)}`;
+    },
+    
+    /**
+     * Convert a base64 data URL to a Blob without fetch (blocked by the CSP for data: URLs)
+     * @param {string} dataUrl - The data URL
+     * @returns {Blob} Blob with the decoded bytes
+     */
+    dataUrlToBlob(dataUrl) {
+        const [header, data] = dataUrl.split(',', 2);
+        const binary = atob(data);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) {
+            bytes[i] = binary.charCodeAt(i);
+        }
+        return new Blob([bytes], { type: header.slice(5).split(';')[0] });
+    },
+    
+    /**
+     * Build a multipart body with album art as a raw file part instead of base64 JSON
+     * @param {Object} fields - Plain form fields
+     * @param {Blob|string} art - Image Blob or data URL
+     * @returns {FormData} The form data
+     */
+    artFormData(fields, art) {
+        const form = new FormData();
+        for (const [key, value] of Object.entries(fields)) {
+            form.append(key, value);
+        }
+        form.append('art', art instanceof Blob ? art : this.dataUrlToBlob(art), 'art');
+        return form;
+    },
+    
     async setMetadata(filepath, data) {
-        return this.call(`/metadata/${encodeURIComponent(filepath)}`, {
+        const url = `/metadata/${encodeURIComponent(filepath)}`;
+        if (data.art) {
+            const { art, ...fields } = data;
+            return this.call(url, {
+                method: 'POST',
+                body: this.artFormData(fields, art)
+            });
+        }
+        return this.call(url, {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify(data)
@@ -96,19 +194,15 @@ window.MetadataRemote.API = {
     },
     
     // Batch operations
-    async applyArtToFolder(folderPath, art) {
-        return this.call('/apply-art-to-folder', {
+    async applyArtToFolder(folderPath, art, onProgress = null) {
+        return this.callStream('/apply-art-to-folder', {
             method: 'POST',
-            headers: {'Content-Type': 'application/json'},
-            body: JSON.stringify({
-                folderPath: folderPath,
-                art: art
-            })
-        });
+            body: this.artFormData({ folderPath: folderPath }, art)
+        }, onProgress);
     },
     
-    async applyFieldToFolder(folderPath, field, value) {
-        return this.call('/apply-field-to-folder', {
+    async applyFieldToFolder(folderPath, field, value, onProgress = null) {
+        return this.callStream('/apply-field-to-folder', {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify({
@@ -116,7 +210,7 @@ window.MetadataRemote.API = {
                 field: field,
                 value: value
             })
-        });
+        }, onProgress);
     },
     
     // Inference operations
@@ -126,7 +220,7 @@ window.MetadataRemote.API = {
     
     // History operations
     async loadHistory() {
-        return this.call('/history');
+        return this.call('/history?summary=1');
     },
     
     async getHistoryAction(actionId) {
@@ -160,15 +254,15 @@ window.MetadataRemote.API = {
     },
     
     // Delete metadata field from entire folder
-    async deleteFieldFromFolder(folderPath, fieldId) {
-        return this.call('/delete-field-from-folder', {
+    async deleteFieldFromFolder(folderPath, fieldId, onProgress = null) {
+        return this.callStream('/delete-field-from-folder', {
             method: 'POST',
             headers: {'Content-Type': 'application/json'},
             body: JSON.stringify({
                 folderPath: folderPath,
                 fieldId: fieldId
             })
-        });
+        }, onProgress);
     },
     
     // Create new metadata field
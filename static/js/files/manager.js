@@ -559,9 +559,9 @@
                         uploadBtn.title = '';
                     }
                     
-                    if (data.hasArt && data.art) {
-                        State.currentAlbumArt = data.art;
-                        const albumArtSrc = `data:image/jpeg;base64,${data.art}`;
+                    if (data.hasArt && data.artVersion) {
+                        const albumArtSrc = API.getAlbumArtUrl(filepath, data.artVersion);
+                        State.currentAlbumArt = albumArtSrc;
                         // Calculate and display metadata
                         const AlbumArt = window.MetadataRemote.Metadata.AlbumArt;
                         if (AlbumArt && AlbumArt.displayAlbumArtWithMetadata) {
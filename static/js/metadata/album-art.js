@@ -50,7 +50,7 @@
         
         /**
          * Calculate image metadata from an image element or data URL
-         * @param {string} imageSrc - The image source (data URL or base64)
+         * @param {string} imageSrc - The image source (data URL or /albumart URL)
          * @returns {Promise<Object>} - Object with width, height, size, and format
          */
         async calculateImageMetadata(imageSrc) {
@@ -74,9 +74,21 @@
                             const padding = (base64.match(/=+$/) || [''])[0].length;
                             metadata.size = Math.floor((base64.length * 3) / 4) - padding;
                         }
+                        resolve(metadata);
+                        return;
                     }
                     
-                    resolve(metadata);
+                    // Served image: read size and format from the (browser-cached) response
+                    fetch(imageSrc)
+                        .then(response => response.blob())
+                        .then(blob => {
+                            metadata.size = blob.size;
+                            if (blob.type.startsWith('image/')) {
+                                metadata.format = blob.type.substring(6).toUpperCase();
+                            }
+                        })
+                        .catch(() => {})
+                        .finally(() => resolve(metadata));
                 };
                 img.onerror = () => {
                     resolve({ width: 0, height: 0, size: 0, format: 'Unknown' });
@@ -85,6 +97,19 @@
             });
         },
         
+        /**
+         * Convert an image source to a Blob for upload
+         * @param {string} imageSrc - A data URL or an /albumart URL
+         * @returns {Promise<Blob>} - The image bytes
+         */
+        async toBlob(imageSrc) {
+            if (imageSrc.startsWith('data:')) return API.dataUrlToBlob(imageSrc);
+            
+            const response = await fetch(imageSrc);
+            if (!response.ok) throw new Error('Failed to load album art');
+            return response.blob();
+        },
+        
         /**
          * Format file size in human-readable format
          * @param {number} bytes - Size in bytes
@@ -230,7 +255,12 @@
             if (!State.currentFile || (!State.pendingAlbumArt && !State.currentAlbumArt)) return;
             
             const button = document.querySelector('.apply-folder-btn');
-            const artToApply = State.pendingAlbumArt || (State.currentAlbumArt ? `data:image/jpeg;base64,${State.currentAlbumArt}` : null);
+            let artToApply = null;
+            try {
+                artToApply = await this.toBlob(State.pendingAlbumArt || State.currentAlbumArt);
+            } catch (err) {
+                console.error('Error loading album art:', err);
+            }
             if (!artToApply) {
                 ButtonStatus.showButtonStatus(button, 'No art', 'error', 2000);
                 return;
@@ -243,7 +273,9 @@
             ButtonStatus.showButtonStatus(button, 'Applying...', 'processing');
             
             try {
-                const result = await API.applyArtToFolder(folderPath, artToApply);
+                const result = await API.applyArtToFolder(folderPath, artToApply, (done, total) => {
+                    ButtonStatus.showButtonStatus(button, `Applying... ${done}/${total}`, 'processing');
+                });
 
                 if (result.status === 'success') {
                     ButtonStatus.showButtonStatus(button, `Applied to ${result.filesUpdated} files!`, 'success', 3000);
@@ -417,9 +417,9 @@
                 const saveImageBtn = document.querySelector('.save-image-btn');
                 const applyFolderBtn = document.querySelector('.apply-folder-btn');
                 
-                if (data.hasArt && data.art) {
-                    State.currentAlbumArt = data.art;
-                    const albumArtSrc = `data:image/jpeg;base64,${data.art}`;
+                if (data.hasArt && data.artVersion) {
+                    const albumArtSrc = API.getAlbumArtUrl(State.currentFile, data.artVersion);
+                    State.currentAlbumArt = albumArtSrc;
                     const AlbumArt = window.MetadataRemote.Metadata.AlbumArt;
                     if (AlbumArt && AlbumArt.displayAlbumArtWithMetadata) {
                         AlbumArt.displayAlbumArtWithMetadata(albumArtSrc, artDisplay);
@@ -560,7 +560,9 @@
             try {
                 // Send normalized value (single space becomes empty)
                 const normalizedValue = value === ' ' ? '' : value;
-                const result = await API.applyFieldToFolder(folderPath, field, normalizedValue);
+                const result = await API.applyFieldToFolder(folderPath, field, normalizedValue, (done, total) => {
+                    showButtonStatus(button, `Applying to folder... ${done}/${total}`, 'processing');
+                });
                 
                 if (result.status === 'success') {
                     showButtonStatus(button, `Applied to ${result.filesUpdated} files!`, 'success', 3000);
@@ -163,7 +163,7 @@
                 // Set loading state
                 document.getElementById('folder-count').textContent = '(loading...)';
                 
-                const data = await API.loadTree();
+                const data = await API.loadTree(State.foldersSort.method === 'size');
                 State.treeData[''] = data.items;
                 this.buildTreeFromData();
                 this.updateSortUI(); // Initialize sort UI
@@ -210,7 +210,15 @@
         /**
          * Rebuild the entire tree maintaining expanded state
          */
-        rebuildTree() {
+        async rebuildTree() {
+            if (State.foldersSort.method === 'size') {
+                try {
+                    await this.loadMissingFolderSizes();
+                } catch (err) {
+                    console.error('Error loading folder sizes:', err);
+                }
+            }
+            
             this.buildTreeFromData();
             
             State.expandedFolders.forEach(path => {
@@ -239,6 +247,21 @@
             }
         },
 
+        /**
+         * Reload tree levels that were fetched without folder sizes
+         * (the backend only computes them on request, for sorting by size)
+         */
+        async loadMissingFolderSizes() {
+            const paths = Object.keys(State.treeData).filter(path =>
+                State.treeData[path].some(item => item.size === undefined)
+            );
+            
+            await Promise.all(paths.map(async path => {
+                const data = path ? await API.loadTreeChildren(path, true) : await API.loadTree(true);
+                State.treeData[path] = data.items;
+            }));
+        },
+
         /**
          * Get the depth level of a path
          * @param {string} path - Folder path
@@ -354,7 +377,7 @@
          */
         async loadTreeChildren(path, container, level) {
             try {
-                const data = await API.loadTreeChildren(path);
+                const data = await API.loadTreeChildren(path, State.foldersSort.method === 'size');
                 State.treeData[path] = data.items;
                 
                 // Apply filtering
@@ -386,8 +409,7 @@
                     // Use created timestamp from the folder data
                     comparison = (a.created || 0) - (b.created || 0);
                 } else if (State.foldersSort.method === 'size') {
-                    // Size sorting will need backend support
-                    // For now, use 0 as default size
+                    // Sizes are loaded on demand (see loadMissingFolderSizes)
                     comparison = (a.size || 0) - (b.size || 0);
                 }
                 